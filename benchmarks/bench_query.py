@@ -0,0 +1,87 @@
+"""Benchmark for the parallel query engine.
+
+Writes a synthetic tasks file in the layout used by Tasker and times
+filtering, text search and status aggregation in a single process against
+the byte-range process pool with an increasing number of workers.
+
+Usage:
+    python benchmarks/bench_query.py [tasks] [max_workers]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from task_cli.query import count_file, count_tasks, filter_tasks, scan_file  # noqa: E402
+
+WORDS = ["deploy", "review", "refactor", "release", "backup", "docs", "infra", "tests"]
+
+
+def write_tasks(path: Path, count: int):
+    """Write synthetic task records to path."""
+    rng = random.Random(42)
+    tasks = [
+        {
+            "id": task_id,
+            "description": " ".join(rng.choices(WORDS, k=6)),
+            "status": rng.choice(["todo", "in-progress", "done"]),
+            "createdAt": "2026-10-01T09:00:00",
+            "updatedAt": None,
+        }
+        for task_id in range(1, count + 1)
+    ]
+    with path.open("w") as f:
+        json.dump(tasks, f, indent=4)
+
+
+def timed(func, *args, **kwargs) -> float:
+    """Return the best wall time of three runs."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def load(path: Path) -> list:
+    with path.open() as f:
+        return json.load(f)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tasks.json"
+        write_tasks(path, count)
+        print(f"{count} tasks, {path.stat().st_size / 2 ** 20:.1f} MiB, {os.cpu_count()} CPUs")
+        print("workers\tfilter\tsearch\tcount")
+
+        serial = [
+            timed(lambda: filter_tasks(load(path), status="todo")),
+            timed(lambda: filter_tasks(load(path), search="release")),
+            timed(lambda: count_tasks(load(path), search="infra")),
+        ]
+        print("serial\t" + "\t".join(f"{seconds:.3f}s" for seconds in serial))
+
+        workers = 1
+        while workers <= max_workers:
+            row = [
+                timed(scan_file, path, status="todo", workers=workers),
+                timed(scan_file, path, search="release", workers=workers),
+                timed(count_file, path, search="infra", workers=workers),
+            ]
+            print(f"{workers}\t" + "\t".join(f"{seconds:.3f}s" for seconds in row))
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,8 @@ Main Features:
     - Update task status (todo/in-progress/done)
     - Persistent JSON storage
     - Task creation and update timestamps
+    - Live watch mode with change notifications
+    - Incremental backups with restore
 
 For command-line usage, see README.md
 """
@@ -20,6 +22,8 @@ __version__ = "0.1.0"
 __author__ = "@quantuumhedgehog"
 __email__ = "lutso.mykhailo@gmail.com"
 
-from .tasker import Tasker, Task
-from .task_cli import parse_arguments, usage_print, ticket_print
-__all__ = ["Tasker", "Task", "parse_arguments", "usage_print", "ticket_print"]
\ No newline at end of file
+from .tasker import Tasker, Task, TaskChanges
+from .task_cli import parse_arguments, usage_print, ticket_print, watch_tasks
+__all__ = [
+    "Tasker", "Task", "TaskChanges", "parse_arguments", "usage_print", "ticket_print", "watch_tasks"
+]
\ No newline at end of file
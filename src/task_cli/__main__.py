@@ -23,11 +23,30 @@ def main():
     Available Commands:
         add <description>     Add a new task
         list [status]        List all tasks or filter by status
+        list --where <expr> [--explain]
+                             List tasks matching a filter expression
+        search <text>        List tasks whose description contains text
+        stats                Show the number of tasks per status
         edit <id> <desc>     Edit task description
         mark-todo <id>       Mark task as todo
         mark-progress <id>   Mark task as in progress
         mark-done <id>       Mark task as done
+        set-priority <id> <level>
+                             Set task priority (low/medium/high)
+        tag <id> <tag>...    Attach tags to a task
+        untag <id> <tag>...  Remove tags from a task
+        set-due <id> <date> [daily|weekly|monthly|yearly]
+                             Set a due date and optional recurrence
+        clear-due <id>       Remove the due date of a task
+        due [--next N] [--overdue]
+                             List the next due or overdue tasks
         rm/remove <id>       Remove a task
+        watch [status]       Live view of tasks, printing only changes
+        fsck [--incremental|--repair]
+                             Check tasks file integrity or salvage it
+        backup [--keep N]    Back up changed blocks, keeping N backup points
+        backups              List backup points
+        restore <point>      Restore the tasks file from a backup point
     """
     result = parse_arguments(sys.argv[1:])
     ticket_print(result)
@@ -0,0 +1,248 @@
+"""Incremental backups of the tasks file.
+
+Backups are stored in a ".backups" directory next to the tasks file. The
+records of the file are grouped into blocks of BLOCK_RECORDS consecutive
+task ids, and every block is stored once under the SHA-256 of its bytes.
+A backup point is a small manifest listing the hashes of its blocks, so a
+backup after a few edits only writes the blocks containing those tasks.
+Grouping by id rather than by position keeps the blocks after a removed
+task unchanged.
+
+Blocks hold the raw record bytes of the file, so restoring a point streams
+the blocks back in order and reproduces the backed-up file byte for byte.
+Manifests are written after their blocks, and blocks no longer referenced
+by any kept manifest are garbage-collected when old points are pruned.
+
+Classes:
+    BackupPoint: Manifest of a single backup
+
+Functions:
+    backup_database: Store a new backup point of a tasks file
+    list_backups: List the backup points of a tasks file
+    restore_database: Rebuild a tasks file from a backup point
+    prune_backups: Drop old backup points and unreferenced blocks
+
+Example:
+    from backup import backup_database, restore_database
+    point, stored = backup_database(Path("tasks.json"))
+    restore_database(Path("tasks.json"), point.point)
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .storage import RECORD_ID, has_record_layout, iter_record_bytes
+
+BACKUP_SUFFIX = ".backups"
+BLOCK_RECORDS = 128
+DEFAULT_KEEP = 10
+MANIFEST_VERSION = 1
+_SEPARATOR = b",\n    "
+
+
+@dataclass
+class BackupPoint:
+    """Manifest of a single backup.
+
+    Attributes:
+        point (int): Backup point number, increasing with every backup
+        created (str): ISO format timestamp of the backup
+        records (int): Number of task records
+        size (int): Size of the backed-up tasks file in bytes
+        blocks (List[str]): SHA-256 hashes of the blocks in file order
+    """
+
+    point: int
+    created: str
+    records: int = 0
+    size: int = 0
+    blocks: List[str] = field(default_factory=list)
+
+
+def _backup_dir(path: Path) -> Path:
+    return path.with_name(path.name + BACKUP_SUFFIX)
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    """Write a file under a temporary name and move it into place."""
+    partial = target.with_name(target.name + ".partial")
+    with open(partial, "wb") as f:
+        f.write(data)
+    os.replace(partial, target)
+
+
+def _iter_blocks(path: Path) -> Iterator[Tuple[int, bytes]]:
+    """Group the raw records of a tasks file into blocks by task id.
+
+    Args:
+        path (Path): Path to the tasks file
+
+    Yields:
+        Tuple[int, bytes]: Number of records in the block and its bytes
+
+    Raises:
+        ValueError: If the file is not in the record layout or a record has no id
+    """
+    if not has_record_layout(path):
+        raise ValueError(f"{path.name} is not in the tasks file layout, run fsck --repair first")
+    group, records = None, []
+    for offset, raw in iter_record_bytes(path):
+        match = RECORD_ID.match(raw)
+        if match is None:
+            raise ValueError(f"Record at byte {offset} has no id, run fsck first")
+        block = int(match.group(1)) // BLOCK_RECORDS
+        if records and block != group:
+            yield len(records), _SEPARATOR.join(records)
+            records = []
+        group = block
+        records.append(raw.rstrip(b","))
+    if records:
+        yield len(records), _SEPARATOR.join(records)
+
+
+def list_backups(path: Path) -> List[BackupPoint]:
+    """List the backup points of a tasks file.
+
+    Args:
+        path (Path): Path to the tasks file
+
+    Returns:
+        List[BackupPoint]: Backup points, oldest first
+    """
+    points = []
+    for manifest in (_backup_dir(Path(path)) / "points").glob("*.json"):
+        with manifest.open("r") as f:
+            data = json.load(f)
+        if data.pop("version", None) == MANIFEST_VERSION:
+            points.append(BackupPoint(**data))
+    return sorted(points, key=lambda point: point.point)
+
+
+def backup_database(path: Path, keep: Optional[int] = DEFAULT_KEEP) -> Tuple[BackupPoint, int]:
+    """Store a new backup point of a tasks file.
+
+    Only blocks whose hash is not stored yet are written. If the file has
+    not changed since the latest point, no new point is created.
+
+    Args:
+        path (Path): Path to the tasks file
+        keep (Optional[int], optional): Number of backup points to keep,
+            see prune_backups. Defaults to DEFAULT_KEEP; None keeps all points.
+
+    Returns:
+        Tuple[BackupPoint, int]: The backup point and the number of newly stored blocks
+
+    Raises:
+        ValueError: If the tasks file cannot be split into records or keep is below 1
+    """
+    path = Path(path)
+    if keep is not None and keep < 1:
+        raise ValueError("At least one backup point must be kept")
+    blocks_dir = _backup_dir(path) / "blocks"
+    points_dir = _backup_dir(path) / "points"
+    blocks_dir.mkdir(parents=True, exist_ok=True)
+    points_dir.mkdir(exist_ok=True)
+
+    hashes, records, stored = [], 0, 0
+    for count, data in _iter_blocks(path):
+        digest = hashlib.sha256(data).hexdigest()
+        if not (blocks_dir / digest).exists():
+            _write_atomic(blocks_dir / digest, zlib.compress(data))
+            stored += 1
+        hashes.append(digest)
+        records += count
+
+    previous = list_backups(path)
+    if previous and previous[-1].blocks == hashes:
+        return previous[-1], 0
+    point = BackupPoint(
+            point=previous[-1].point + 1 if previous else 1,
+            created=datetime.now().isoformat(),
+            records=records,
+            size=path.stat().st_size,
+            blocks=hashes,
+    )
+    manifest = json.dumps({"version": MANIFEST_VERSION, **asdict(point)}, indent=4)
+    _write_atomic(points_dir / f"{point.point}.json", manifest.encode())
+    if keep is not None:
+        prune_backups(path, keep)
+    return point, stored
+
+
+def prune_backups(path: Path, keep: int) -> Tuple[int, int]:
+    """Drop old backup points and unreferenced blocks.
+
+    The newest `keep` points are kept. Every block not listed by a kept
+    manifest is deleted afterwards, including blocks left behind by an
+    interrupted backup.
+
+    Args:
+        path (Path): Path to the tasks file
+        keep (int): Number of newest backup points to keep
+
+    Returns:
+        Tuple[int, int]: Number of removed points and removed blocks
+    """
+    path = Path(path)
+    points = list_backups(path)
+    expired = points[:max(0, len(points) - keep)]
+    for point in expired:
+        (_backup_dir(path) / "points" / f"{point.point}.json").unlink()
+
+    referenced = {digest for point in points[len(expired):] for digest in point.blocks}
+    removed = 0
+    blocks_dir = _backup_dir(path) / "blocks"
+    if blocks_dir.exists():
+        for block in blocks_dir.iterdir():
+            if block.name not in referenced:
+                block.unlink()
+                removed += 1
+    return len(expired), removed
+
+
+def restore_database(path: Path, point: int) -> int:
+    """Rebuild a tasks file from a backup point.
+
+    Blocks are verified against their hash and streamed into a new file,
+    which then replaces the tasks file, so a failed restore leaves the
+    current file untouched.
+
+    Args:
+        path (Path): Path to the tasks file
+        point (int): Backup point number
+
+    Returns:
+        int: Number of restored records
+
+    Raises:
+        ValueError: If the point does not exist or one of its blocks is missing or damaged
+    """
+    path = Path(path)
+    manifest = next((item for item in list_backups(path) if item.point == point), None)
+    if manifest is None:
+        raise ValueError(f"Backup point {point} not found")
+    blocks_dir = _backup_dir(path) / "blocks"
+    fresh = path.with_name(path.name + ".restore")
+    try:
+        with open(fresh, "wb") as f:
+            for position, digest in enumerate(manifest.blocks):
+                try:
+                    data = zlib.decompress((blocks_dir / digest).read_bytes())
+                except (OSError, zlib.error):
+                    raise ValueError(f"Block {digest} of backup point {point} is unreadable") from None
+                if hashlib.sha256(data).hexdigest() != digest:
+                    raise ValueError(f"Block {digest} of backup point {point} is damaged")
+                f.write(_SEPARATOR if position else b"[\n    ")
+                f.write(data)
+            f.write(b"\n]" if manifest.blocks else b"[]")
+    except BaseException:
+        fresh.unlink(missing_ok=True)
+        raise
+    os.replace(fresh, path)
+    return manifest.records
@@ -0,0 +1,320 @@
+"""Filter expression parsing module.
+
+This module parses filter expressions such as
+
+    status in (todo, in-progress) and description ~ 'deploy' and updated > 2026-10-01
+
+into a tree of predicate nodes. Each node is compiled once: field names are
+resolved to record keys, values are converted to the field type and the
+comparison operator is looked up, so evaluating a record is a chain of
+plain function calls. Nodes are ordinary objects and can be pickled to
+worker processes.
+
+Grammar:
+    expression := term ("or" term)*
+    term       := factor ("and" factor)*
+    factor     := "not" factor | "(" expression ")" | clause
+    clause     := field operator value | field "in" "(" value ("," value)* ")"
+    operator   := "=" | "!=" | "<" | "<=" | ">" | ">=" | "~"
+
+Fields are id, status, priority, tag, description, created, updated and due.
+Values are bare words or single/double quoted strings; "~" is a
+case-insensitive substring match. Priority and tag only support "=", "!="
+and "in"; "tag = x" matches tasks carrying tag x. Timestamps are compared
+as ISO strings, so a date matches from the start of that day.
+
+Classes:
+    Compare: A comparison between a record field and a value
+    InList: A membership test of a record field in a list of values
+    And, Or, Not: Boolean combinations of predicates
+
+Functions:
+    parse_expression: Parse an expression string into a predicate tree
+
+Example:
+    from expression import parse_expression
+    predicate = parse_expression("status = todo and id >= 10")
+    matches = [task for task in records if predicate(task)]
+"""
+
+import operator
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+FIELDS = {
+    "id": "id",
+    "status": "status",
+    "priority": "priority",
+    "tag": "tags",
+    "description": "description",
+    "created": "createdAt",
+    "updated": "updatedAt",
+    "due": "due",
+}
+TIMESTAMP_FIELDS = {"createdAt", "updatedAt", "due"}
+EQUALITY_ONLY_FIELDS = {"priority", "tags"}
+KEYWORDS = {"and", "or", "not", "in"}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<op><=|>=|!=|=|<|>|~|\(|\)|,)
+      | '(?P<single>[^']*)'
+      | "(?P<double>[^"]*)"
+      | (?P<word>[\w.:+-]+)
+    )""", re.VERBOSE)
+
+
+def _contains(value: str, needle: str) -> bool:
+    return needle in value.casefold()
+
+
+def _has_tag(tags: List[str], tag: str) -> bool:
+    return tag in tags
+
+
+def _lacks_tag(tags: List[str], tag: str) -> bool:
+    return tag not in tags
+
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "~": _contains,
+}
+
+
+def _convert(key: str, value: str) -> Any:
+    """Convert a literal to the type of the record field it is compared with."""
+    if key == "id":
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"id must be compared with an integer, got {value!r}") from None
+    if key in TIMESTAMP_FIELDS:
+        try:
+            return datetime.fromisoformat(value).isoformat()
+        except ValueError:
+            raise ValueError(f"invalid timestamp {value!r}") from None
+    return value
+
+
+class Compare:
+    """A comparison between a record field and a value.
+
+    Attributes:
+        field (str): Field name as written in the expression
+        key (str): Record key the field maps to
+        op (str): Comparison operator
+        value (Any): Value converted to the field type
+    """
+
+    def __init__(self, field: str, op: str, value: str):
+        if field not in FIELDS:
+            raise ValueError(f"unknown field {field!r}, expected one of {', '.join(FIELDS)}")
+        self.field = field
+        self.key = FIELDS[field]
+        self.op = op
+        if self.key in EQUALITY_ONLY_FIELDS and op not in ("=", "!="):
+            raise ValueError(f"{field} can only be compared with '=', '!=' or 'in'")
+        if op == "~":
+            if self.key != "description":
+                raise ValueError("'~' can only be used with description")
+            self.value = value.casefold()
+        else:
+            self.value = _convert(self.key, value)
+        if self.key == "tags":
+            self._test = _has_tag if op == "=" else _lacks_tag
+        else:
+            self._test = OPERATORS[op]
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        value = record.get(self.key)
+        if value is None:
+            return self.op == "!="
+        return self._test(value, self.value)
+
+    def __str__(self) -> str:
+        return f"{self.field} {self.op} {self.value!r}"
+
+
+class InList:
+    """A membership test of a record field in a list of values.
+
+    Attributes:
+        field (str): Field name as written in the expression
+        key (str): Record key the field maps to
+        values (frozenset): Values converted to the field type
+    """
+
+    def __init__(self, field: str, values: List[str]):
+        if field not in FIELDS:
+            raise ValueError(f"unknown field {field!r}, expected one of {', '.join(FIELDS)}")
+        self.field = field
+        self.key = FIELDS[field]
+        self.values = frozenset(_convert(self.key, value) for value in values)
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        if self.key == "tags":
+            return not self.values.isdisjoint(record.get(self.key) or ())
+        return record.get(self.key) in self.values
+
+    def __str__(self) -> str:
+        return f"{self.field} in ({', '.join(map(str, sorted(self.values)))})"
+
+
+class And:
+    """Conjunction of predicates."""
+
+    def __init__(self, children: List[Callable]):
+        self.children = children
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        return all(child(record) for child in self.children)
+
+    def __str__(self) -> str:
+        return " and ".join(
+                f"({child})" if isinstance(child, Or) else str(child) for child in self.children
+        )
+
+
+class Or:
+    """Disjunction of predicates."""
+
+    def __init__(self, children: List[Callable]):
+        self.children = children
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        return any(child(record) for child in self.children)
+
+    def __str__(self) -> str:
+        return " or ".join(str(child) for child in self.children)
+
+
+class Not:
+    """Negation of a predicate."""
+
+    def __init__(self, child: Callable):
+        self.child = child
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        return not self.child(record)
+
+    def __str__(self) -> str:
+        if isinstance(self.child, (And, Or)):
+            return f"not ({self.child})"
+        return f"not {self.child}"
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    """Split an expression into (kind, text) tokens."""
+    tokens, position = [], 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise ValueError(f"unexpected character {text[position:].lstrip()[:1]!r} in expression")
+        position = match.end()
+        if match.group("op"):
+            tokens.append(("op", match.group("op")))
+        elif match.group("word") is not None:
+            word = match.group("word")
+            kind = "keyword" if word.lower() in KEYWORDS else "word"
+            tokens.append((kind, word.lower() if kind == "keyword" else word))
+        else:
+            value = match.group("single")
+            tokens.append(("string", value if value is not None else match.group("double")))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser for filter expressions."""
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self) -> Tuple[str, str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return "end", ""
+
+    def take(self, kind: Optional[str] = None, text: Optional[str] = None) -> str:
+        token_kind, token_text = self.peek()
+        if (kind and token_kind != kind) or (text and token_text != text):
+            found = token_text or "end of expression"
+            raise ValueError(f"expected {text or kind}, found {found!r}")
+        self.position += 1
+        return token_text
+
+    def expression(self) -> Callable:
+        children = [self.term()]
+        while self.peek() == ("keyword", "or"):
+            self.take()
+            children.append(self.term())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def term(self) -> Callable:
+        children = [self.factor()]
+        while self.peek() == ("keyword", "and"):
+            self.take()
+            children.append(self.factor())
+        return children[0] if len(children) == 1 else And(children)
+
+    def factor(self) -> Callable:
+        if self.peek() == ("keyword", "not"):
+            self.take()
+            return Not(self.factor())
+        if self.peek() == ("op", "("):
+            self.take()
+            node = self.expression()
+            self.take("op", ")")
+            return node
+        return self.clause()
+
+    def value(self) -> str:
+        kind, text = self.peek()
+        if kind not in ("word", "string"):
+            raise ValueError(f"expected a value, found {text or 'end of expression'!r}")
+        self.position += 1
+        return text
+
+    def clause(self) -> Callable:
+        field = self.take("word")
+        if self.peek() == ("keyword", "in"):
+            self.take()
+            self.take("op", "(")
+            values = [self.value()]
+            while self.peek() == ("op", ","):
+                self.take()
+                values.append(self.value())
+            self.take("op", ")")
+            return InList(field, values)
+        kind, op = self.peek()
+        if kind != "op" or op not in OPERATORS:
+            raise ValueError(f"expected an operator after {field!r}, found {op or 'end of expression'!r}")
+        self.take()
+        return Compare(field, op, self.value())
+
+
+def parse_expression(text: str) -> Callable[[Dict[str, Any]], bool]:
+    """Parse an expression string into a compiled predicate tree.
+
+    Args:
+        text (str): Filter expression
+
+    Returns:
+        Callable[[Dict[str, Any]], bool]: Predicate over task records
+
+    Raises:
+        ValueError: If the expression is malformed or uses unknown fields
+    """
+    parser = _Parser(text)
+    node = parser.expression()
+    if parser.peek()[0] != "end":
+        raise ValueError(f"unexpected {parser.peek()[1]!r} in expression")
+    return node
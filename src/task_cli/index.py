@@ -0,0 +1,217 @@
+"""Bitmap index module.
+
+This module keeps one bitmap over task ids for every status, priority and
+tag value. A bitmap is a Python integer whose bit N is set when task N has
+the value, so combined filters become integer AND/OR/NOT operations.
+It also keeps the due times of open tasks sorted, for the schedule module.
+
+The index is persisted next to the tasks file once a query needs it. Bitmaps are stored as
+zlib-compressed little-endian bytes, which shrinks the long runs of zero
+bits of sparse values to a few bytes. The index records the stat
+signature of the tasks file it was built from, and is rebuilt when the
+file was changed by anything other than Tasker.
+
+Classes:
+    TaskIndex: Bitmaps over task ids for the indexed record fields
+
+Functions:
+    bitmap_from_ids: Build a bitmap from task ids
+    iter_ids: Iterate the task ids set in a bitmap
+    id_range_mask: Build a bitmap of all ids in an inclusive range
+
+Example:
+    from index import TaskIndex
+    index = TaskIndex.build(records)
+    todo_infra = index.lookup("status", "todo") & index.lookup("tags", "infra")
+"""
+
+import base64
+import json
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+INDEX_SUFFIX = ".index"
+INDEX_VERSION = 2
+INDEXED_FIELDS = ("status", "priority", "tags")
+
+
+def bitmap_from_ids(ids: Iterable[int]) -> int:
+    """Build a bitmap from task ids.
+
+    Args:
+        ids (Iterable[int]): Non-negative task ids
+
+    Returns:
+        int: Bitmap with the bit of every id set
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    bits = bytearray((max(ids) >> 3) + 1)
+    for task_id in ids:
+        bits[task_id >> 3] |= 1 << (task_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+def iter_ids(bitmap: int) -> Iterator[int]:
+    """Iterate the task ids set in a bitmap in ascending order.
+
+    Args:
+        bitmap (int): Bitmap over task ids
+
+    Yields:
+        int: Task id of every set bit
+    """
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, "little")
+    for position, byte in enumerate(data):
+        if byte:
+            base = position << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield base + bit
+
+
+def id_range_mask(low: Optional[int], high: Optional[int], width: Optional[int] = None) -> int:
+    """Build a bitmap of all ids in an inclusive range.
+
+    Args:
+        low (Optional[int]): Lowest id, None for unbounded
+        high (Optional[int]): Highest id, None for unbounded
+        width (Optional[int], optional): Bit length of the bitmap the mask is
+            applied to. Bounds beyond it are clamped, so the size of the mask
+            follows the data rather than the bounds. Defaults to None.
+
+    Returns:
+        int: Mask to AND with a bitmap; -1 (all bits) if both ends are unbounded
+    """
+    if width is not None:
+        low = min(low, width) if low is not None else None
+        high = min(high, width) if high is not None else None
+    if high is None:
+        mask = -1
+    else:
+        mask = (1 << (high + 1)) - 1 if high >= 0 else 0
+    if low is not None and low > 0:
+        mask &= ~((1 << low) - 1)
+    return mask
+
+
+def _encode(bitmap: int) -> str:
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, "little")
+    return base64.b64encode(zlib.compress(data)).decode("ascii")
+
+
+def _decode(text: str) -> int:
+    return int.from_bytes(zlib.decompress(base64.b64decode(text)), "little")
+
+
+class TaskIndex:
+    """Bitmaps over task ids for the indexed record fields.
+
+    Attributes:
+        ids (int): Bitmap of all task ids
+        bitmaps (Dict[str, Dict[Any, int]]): Bitmap per value of every indexed field
+        due (List[Tuple[str, int, Optional[str]]]): Due time, task id and
+            recurrence rule of every task that is not done, sorted by due time
+        signature (Optional[List[int]]): Stat signature of the indexed tasks file
+    """
+
+    def __init__(
+            self,
+            ids: int,
+            bitmaps: Dict[str, Dict[Any, int]],
+            due: Optional[List[Tuple[str, int, Optional[str]]]] = None,
+            signature: Optional[List[int]] = None,
+    ):
+        self.ids = ids
+        self.bitmaps = bitmaps
+        self.due = due or []
+        self.signature = list(signature) if signature is not None else None
+
+    @classmethod
+    def build(cls, records: List[Dict[str, Any]], signature=None) -> "TaskIndex":
+        """Build an index from task records.
+
+        Args:
+            records (List[Dict[str, Any]]): Task records
+            signature (optional): Stat signature of the tasks file. Defaults to None.
+
+        Returns:
+            TaskIndex: Index over the records
+        """
+        postings: Dict[str, Dict[Any, List[int]]] = {
+            field: defaultdict(list) for field in INDEXED_FIELDS
+        }
+        for record in records:
+            task_id = record["id"]
+            postings["status"][record["status"]].append(task_id)
+            postings["priority"][record.get("priority", "medium")].append(task_id)
+            for tag in record.get("tags", []):
+                postings["tags"][tag].append(task_id)
+        bitmaps = {
+            field: {value: bitmap_from_ids(ids) for value, ids in values.items()}
+            for field, values in postings.items()
+        }
+        due = sorted(
+                (record["due"], record["id"], record.get("recurrence"))
+                for record in records
+                if record.get("due") and record["status"] != "done"
+        )
+        return cls(bitmap_from_ids(record["id"] for record in records), bitmaps, due, signature)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["TaskIndex"]:
+        """Load a persisted index.
+
+        Args:
+            path (Path): Path to the index file
+
+        Returns:
+            Optional[TaskIndex]: The index, or None if missing, unreadable or of another version
+        """
+        try:
+            with Path(path).open("r") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return None
+            bitmaps = {
+                field: {value: _decode(bitmap) for value, bitmap in values.items()}
+                for field, values in data["bitmaps"].items()
+            }
+            due = [tuple(entry) for entry in data["due"]]
+            return cls(_decode(data["ids"]), bitmaps, due, data["signature"])
+        except (OSError, ValueError, KeyError, TypeError, zlib.error):
+            return None
+
+    def save(self, path: Path) -> None:
+        """Persist the index.
+
+        Args:
+            path (Path): Path to the index file
+        """
+        data = {
+            "version": INDEX_VERSION,
+            "signature": self.signature,
+            "ids": _encode(self.ids),
+            "bitmaps": {
+                field: {value: _encode(bitmap) for value, bitmap in values.items()}
+                for field, values in self.bitmaps.items()
+            },
+            "due": self.due,
+        }
+        with Path(path).open("w") as f:  # type: Any
+            json.dump(data, f)
+
+    def lookup(self, field: str, value: Any) -> int:
+        """Get the bitmap of tasks with a field value.
+
+        Args:
+            field (str): Indexed record field
+            value (Any): Field value
+
+        Returns:
+            int: Bitmap of matching task ids, 0 if the value is unknown
+        """
+        return self.bitmaps.get(field, {}).get(value, 0)
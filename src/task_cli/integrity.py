@@ -0,0 +1,335 @@
+"""Tasks database integrity check and repair.
+
+This module streams the tasks file record by record, validates each record
+and verifies the checksum written by the storage layer. Only the set of
+previous task id is kept in memory, since ids must be strictly increasing,
+so a check does not load the whole file.
+
+An incremental check remembers a CRC32 of the raw bytes of every record
+that passed, in a state file next to the database, and skips the full
+validation of records whose bytes have not changed since that run.
+
+Classes:
+    FsckIssue: A single problem found in the tasks file
+    FsckReport: Result of an integrity check
+
+Functions:
+    check_database: Validate a tasks file
+    repair_database: Salvage valid records into a fresh tasks file
+
+Example:
+    from integrity import check_database
+    report = check_database(Path("tasks.json"))
+    print(report.ok, report.errors)
+"""
+
+import json
+import os
+import zlib
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .storage import (
+    ARRAY_END,
+    CHECKSUM_FIELD,
+    RECORD_ID,
+    has_record_layout,
+    iter_record_bytes,
+    record_checksum,
+    seal_record,
+    write_records,
+)
+from .schedule import RECURRENCE_RULES
+from .tasker import TASK_PRIORITIES, Task
+
+TASK_STATUSES = ("todo", "in-progress", "done")
+TASK_FIELDS = {task_field.name for task_field in fields(Task)}
+STATE_SUFFIX = ".fsck"
+CORRUPT_SUFFIX = ".corrupt"
+
+
+@dataclass
+class FsckIssue:
+    """A single problem found in the tasks file.
+
+    Attributes:
+        offset (int): Byte offset of the record in the file
+        task_id (Optional[int]): Task ID if it could be read
+        message (str): Description of the problem
+    """
+
+    offset: int
+    task_id: Optional[int]
+    message: str
+
+    def __str__(self) -> str:
+        task = f"task {self.task_id}" if self.task_id is not None else "unknown task"
+        return f"offset {self.offset}, {task}: {self.message}"
+
+
+@dataclass
+class FsckReport:
+    """Result of an integrity check.
+
+    Attributes:
+        records (int): Number of records found
+        skipped (int): Records not revalidated because they were unchanged
+        errors (List[FsckIssue]): Problems that prevent loading the tasks
+        warnings (List[FsckIssue]): Problems that do not prevent loading
+    """
+
+    records: int = 0
+    skipped: int = 0
+    errors: List[FsckIssue] = field(default_factory=list)
+    warnings: List[FsckIssue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if no errors were found."""
+        return not self.errors
+
+
+def _is_timestamp(value: Any) -> bool:
+    """Check whether a value is an ISO format timestamp string."""
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def validate_record(record: Any) -> Tuple[List[str], List[str]]:
+    """Validate the schema and checksum of a single decoded record.
+
+    Args:
+        record (Any): Decoded JSON value of a stored record
+
+    Returns:
+        Tuple[List[str], List[str]]: Error and warning messages
+    """
+    if not isinstance(record, dict):
+        return ["record is not an object"], []
+
+    errors, warnings = [], []
+    task_id = record.get("id")
+    if isinstance(task_id, bool) or not isinstance(task_id, int) or task_id < 1:
+        errors.append("id must be a positive integer")
+    if not isinstance(record.get("description"), str):
+        errors.append("description must be a string")
+    if record.get("status") not in TASK_STATUSES:
+        errors.append(f"invalid status {record.get('status')!r}")
+    if not _is_timestamp(record.get("createdAt")):
+        errors.append("createdAt must be an ISO timestamp")
+    if record.get("updatedAt") is not None and not _is_timestamp(record["updatedAt"]):
+        errors.append("updatedAt must be an ISO timestamp or null")
+    if "priority" in record and record["priority"] not in TASK_PRIORITIES:
+        errors.append(f"invalid priority {record['priority']!r}")
+    if record.get("due") is not None and not _is_timestamp(record["due"]):
+        errors.append("due must be an ISO timestamp or null")
+    if record.get("recurrence") is not None:
+        if record["recurrence"] not in RECURRENCE_RULES:
+            errors.append(f"invalid recurrence {record['recurrence']!r}")
+        elif record.get("due") is None:
+            errors.append("recurrence requires a due date")
+    tags = record.get("tags", [])
+    if not isinstance(tags, list) or not all(isinstance(tag, str) and tag for tag in tags):
+        errors.append("tags must be a list of non-empty strings")
+    unknown = set(record) - TASK_FIELDS - {CHECKSUM_FIELD}
+    if unknown:
+        errors.append(f"unknown fields {sorted(unknown)}")
+
+    if CHECKSUM_FIELD not in record:
+        warnings.append("missing checksum")
+    elif record[CHECKSUM_FIELD] != record_checksum(record):
+        errors.append("checksum mismatch")
+    return errors, warnings
+
+
+def _iter_raw_records(path: Path, report: FsckReport) -> Iterator[Tuple[int, bytes]]:
+    """Yield raw records of a tasks file, recording structural problems.
+
+    Files in the record layout are streamed. Other valid JSON arrays are
+    decoded in memory and re-encoded record by record. Anything else is
+    scanned for record boundaries so readable records can still be found.
+    """
+    if not has_record_layout(path):
+        try:
+            with open(path, "rb") as f:
+                records = json.load(f)
+        except ValueError as error:
+            report.errors.append(FsckIssue(0, None, f"unreadable file: {error}"))
+        else:
+            if not isinstance(records, list):
+                report.errors.append(FsckIssue(0, None, "tasks file is not a JSON array"))
+                return
+            for index, record in enumerate(records):
+                yield index, json.dumps(record).encode()
+            return
+
+    with open(path, "rb") as f:
+        f.seek(-min(len(ARRAY_END), f.seek(0, 2)), 2)
+        tail = f.read().rstrip()
+    if not tail.endswith(ARRAY_END) and tail != b"[]":
+        report.errors.append(FsckIssue(0, None, "missing end of task array"))
+
+    pending = None
+    for offset, raw in iter_record_bytes(path):
+        if pending is not None:
+            if pending[1].endswith(b","):
+                yield pending[0], pending[1][:-1]
+            else:
+                report.errors.append(FsckIssue(pending[0], None, "missing separator after record"))
+                yield pending
+        pending = offset, raw
+    if pending is not None:
+        yield pending
+
+
+def _state_file(path: Path) -> Path:
+    return path.with_name(path.name + STATE_SUFFIX)
+
+
+def _load_state(path: Path) -> Dict[str, int]:
+    """Load raw record checksums remembered by the previous check."""
+    try:
+        with _state_file(path).open("r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def check_database(path: Path, incremental: bool = False) -> FsckReport:
+    """Validate a tasks file.
+
+    Checks that every record decodes, matches the Task schema, has a valid
+    status, priority, tags, timestamps and recurrence, carries a correct
+    checksum and has an id greater than the previous record. The query
+    planner and the due scheduler rely on records being in id order.
+
+    Args:
+        path (Path): Path to the tasks file
+        incremental (bool, optional): Skip records whose bytes are unchanged
+            since the last check. Defaults to False.
+
+    Returns:
+        FsckReport: Records checked and problems found
+    """
+    path = Path(path)
+    report = FsckReport()
+    previous = _load_state(path) if incremental else {}
+    verified: Dict[str, int] = {}
+    previous_id = None
+
+    for offset, raw in _iter_raw_records(path, report):
+        report.records += 1
+        raw_crc = zlib.crc32(raw)
+        match = RECORD_ID.match(raw)
+        if match and previous.get(match.group(1).decode()) == raw_crc:
+            task_id = int(match.group(1))
+            report.skipped += 1
+        else:
+            try:
+                record = json.loads(raw)
+            except ValueError as error:
+                report.errors.append(FsckIssue(offset, None, f"unreadable record: {error}"))
+                continue
+            task_id = record.get("id") if isinstance(record, dict) else None
+            errors, warnings = validate_record(record)
+            report.errors.extend(FsckIssue(offset, task_id, message) for message in errors)
+            report.warnings.extend(FsckIssue(offset, task_id, message) for message in warnings)
+            if errors:
+                continue
+
+        if previous_id is not None and task_id <= previous_id:
+            message = "duplicate id" if task_id == previous_id else "id not in ascending order"
+            report.errors.append(FsckIssue(offset, task_id, message))
+            continue
+        previous_id = task_id
+        verified[str(task_id)] = raw_crc
+
+    with _state_file(path).open("w") as f:  # type: Any
+        json.dump(verified, f)
+    return report
+
+
+def _salvage(raw: bytes) -> Optional[Dict[str, Any]]:
+    """Decode a raw record, ignoring bytes after the first complete JSON object."""
+    text = raw.decode("utf-8", errors="replace")
+    try:
+        record = json.loads(text)
+    except ValueError:
+        try:
+            record, _ = json.JSONDecoder().raw_decode(text)
+        except ValueError:
+            return None
+    return record if isinstance(record, dict) else None
+
+
+def _in_id_order(path: Path) -> bool:
+    """Check whether the readable ids of a tasks file are strictly increasing."""
+    previous_id = None
+    for _, raw in _iter_raw_records(path, FsckReport()):
+        match = RECORD_ID.match(raw)
+        if match:
+            task_id = int(match.group(1))
+            if previous_id is not None and task_id <= previous_id:
+                return False
+            previous_id = task_id
+    return True
+
+
+def _corrupt_copy(path: Path) -> Path:
+    """Find an unused name for the copy of a damaged tasks file."""
+    copy = path.with_name(path.name + CORRUPT_SUFFIX)
+    number = 0
+    while copy.exists():
+        number += 1
+        copy = path.with_name(f"{path.name}{CORRUPT_SUFFIX}.{number}")
+    return copy
+
+
+def repair_database(path: Path) -> Tuple[int, int]:
+    """Salvage valid records into a fresh tasks file.
+
+    Records are streamed into a new file. Unreadable records, records that
+    fail validation (including a checksum mismatch) and later duplicates of
+    an id are dropped. Kept records are written unchanged, so a damaged
+    record is never given a fresh checksum; only records from older files
+    without a checksum are sealed. Kept records are sorted by id, which
+    holds them in memory only if the file was out of order. The original
+    file is kept next to the database with a ".corrupt" suffix, numbered
+    if an earlier copy exists, so repeated repairs never overwrite one.
+
+    Args:
+        path (Path): Path to the tasks file
+
+    Returns:
+        Tuple[int, int]: Number of salvaged and dropped records
+    """
+    path = Path(path)
+    fresh = path.with_name(path.name + ".repair")
+    seen_ids = set()
+    dropped = 0
+
+    def salvaged() -> Iterator[Dict[str, Any]]:
+        nonlocal dropped
+        for _, raw in _iter_raw_records(path, FsckReport()):
+            record = _salvage(raw)
+            if record is None or validate_record(record)[0] or record["id"] in seen_ids:
+                dropped += 1
+                continue
+            seen_ids.add(record["id"])
+            yield record if CHECKSUM_FIELD in record else seal_record(record)
+
+    records = salvaged()
+    if not _in_id_order(path):
+        records = sorted(records, key=lambda record: record["id"])
+    kept = write_records(fresh, records)
+    os.replace(path, _corrupt_copy(path))
+    os.replace(fresh, path)
+    _state_file(path).unlink(missing_ok=True)
+    return kept, dropped
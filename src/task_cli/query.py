@@ -0,0 +1,353 @@
+"""Query execution module.
+
+This module evaluates filters, text search and aggregations over task
+records. Records already in memory are processed in the calling process.
+Files above PARALLEL_THRESHOLD bytes are split into byte ranges that are
+parsed and evaluated in a process pool, so each worker only decodes its
+own share of the file, and the matches are merged back in id order.
+
+Filter expressions (see the expression module) are run through a small
+planner: clauses that an index can answer are pushed down to it and only
+the remaining candidates are checked against the residual predicate.
+Status, priority and tag clauses are answered by the bitmap index (see the
+index module). Tasker stores records in id order, so id ranges are
+resolved by binary search over the records; a file edited out of id order
+is answered with a full scan instead.
+
+Classes:
+    QueryPlan: Chosen access path and statistics for a filter expression
+
+Functions:
+    filter_tasks: Select in-memory task records by status and search text
+    count_tasks: Count in-memory task records per status
+    use_parallel_scan: Decide whether a tasks file should be scanned in parallel
+    scan_file: Select task records from a file using a process pool
+    count_file: Count task records per status using a process pool
+    plan_query: Split a predicate into index lookups and a residual filter
+    execute_plan: Run a query plan over task records in id order
+
+Example:
+    from query import filter_tasks
+    matches = filter_tasks(records, status="todo", search="deploy")
+"""
+
+import heapq
+import operator
+import os
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import reduce
+from itertools import pairwise
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .expression import And, Compare, InList, Not, Or
+from .index import INDEXED_FIELDS, TaskIndex, id_range_mask, iter_ids
+from .storage import has_record_layout, read_range, split_ranges, unseal_record
+
+PARALLEL_THRESHOLD = 8 * 1024 * 1024
+RANGES_PER_WORKER = 2
+
+
+def _matches(task: Dict[str, Any], status: Optional[str], needle: Optional[str]) -> bool:
+    """Check a single task record against status and casefolded search text."""
+    if status and task["status"] != status:
+        return False
+    if needle and needle not in task["description"].casefold():
+        return False
+    return True
+
+
+def _scan_range(
+        path: Path, start: int, end: int, status: Optional[str], needle: Optional[str]
+) -> List[Dict[str, Any]]:
+    """Decode and filter the records of one byte range, sorted by id."""
+    matches = [
+        unseal_record(task) for task in read_range(path, start, end) if _matches(task, status, needle)
+    ]
+    matches.sort(key=lambda task: task["id"])
+    return matches
+
+
+def _count_range(path: Path, start: int, end: int, needle: Optional[str]) -> Counter:
+    """Decode one byte range and count the statuses of matching records."""
+    return Counter(
+            task["status"] for task in read_range(path, start, end) if _matches(task, None, needle)
+    )
+
+
+def filter_tasks(
+        tasks: List[Dict[str, Any]], status: Optional[str] = None, search: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Select task records matching a status and a search text.
+
+    Args:
+        tasks (List[Dict[str, Any]]): Task records to filter
+        status (Optional[str], optional): Required status. Defaults to None.
+        search (Optional[str], optional): Case-insensitive substring of the
+            description. Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: Matching records in their original order
+    """
+    needle = search.casefold() if search else None
+    return [task for task in tasks if _matches(task, status, needle)]
+
+
+def count_tasks(tasks: List[Dict[str, Any]], search: Optional[str] = None) -> Dict[str, int]:
+    """Count task records per status.
+
+    Args:
+        tasks (List[Dict[str, Any]]): Task records to aggregate
+        search (Optional[str], optional): Only count records whose description
+            contains this text. Defaults to None.
+
+    Returns:
+        Dict[str, int]: Number of matching records for each status
+    """
+    needle = search.casefold() if search else None
+    return dict(Counter(task["status"] for task in tasks if _matches(task, None, needle)))
+
+
+def use_parallel_scan(path: Path, workers: Optional[int] = None) -> bool:
+    """Decide whether a tasks file should be scanned in a process pool.
+
+    Args:
+        path (Path): Path to the tasks file
+        workers (Optional[int], optional): Pool size. Defaults to the CPU count.
+
+    Returns:
+        bool: True if the file is large enough, several CPUs are available
+            and the file uses the record layout written by Tasker
+    """
+    workers = workers or os.cpu_count() or 1
+    return (
+            workers > 1
+            and Path(path).stat().st_size >= PARALLEL_THRESHOLD
+            and has_record_layout(path)
+    )
+
+
+def scan_file(
+        path: Path,
+        status: Optional[str] = None,
+        search: Optional[str] = None,
+        workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Select task records from a tasks file using a process pool.
+
+    Args:
+        path (Path): Path to a tasks file in the record layout
+        status (Optional[str], optional): Required status. Defaults to None.
+        search (Optional[str], optional): Case-insensitive substring of the
+            description. Defaults to None.
+        workers (Optional[int], optional): Pool size. Defaults to the CPU count.
+
+    Returns:
+        List[Dict[str, Any]]: Matching records in id order
+    """
+    needle = search.casefold() if search else None
+    workers = workers or os.cpu_count() or 1
+    ranges = split_ranges(path, workers * RANGES_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = [
+            pool.submit(_scan_range, path, start, end, status, needle) for start, end in ranges
+        ]
+        return list(heapq.merge(*(result.result() for result in results),
+                                key=lambda task: task["id"]))
+
+
+def count_file(
+        path: Path, search: Optional[str] = None, workers: Optional[int] = None
+) -> Dict[str, int]:
+    """Count task records per status using a process pool.
+
+    Args:
+        path (Path): Path to a tasks file in the record layout
+        search (Optional[str], optional): Only count records whose description
+            contains this text. Defaults to None.
+        workers (Optional[int], optional): Pool size. Defaults to the CPU count.
+
+    Returns:
+        Dict[str, int]: Number of matching records for each status
+    """
+    needle = search.casefold() if search else None
+    workers = workers or os.cpu_count() or 1
+    total = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = [
+            pool.submit(_count_range, path, start, end, needle)
+            for start, end in split_ranges(path, workers * RANGES_PER_WORKER)
+        ]
+        for result in results:
+            total.update(result.result())
+    return dict(total)
+
+
+@dataclass
+class QueryPlan:
+    """Chosen access path and statistics for a filter expression.
+
+    Attributes:
+        predicate (Callable): The full compiled predicate
+        id_low (Optional[int]): Lowest id that can match, None if unbounded
+        id_high (Optional[int]): Highest id that can match, None if unbounded
+        indexed (List[Callable]): Clauses answered by the bitmap index
+        bitmap (Optional[int]): Combined bitmap of the indexed clauses
+        residual (Optional[Callable]): Predicate checked on every candidate
+        total (int): Records in the task set
+        examined (int): Candidate records read after index lookups
+        returned (int): Records matching the predicate
+    """
+
+    predicate: Callable
+    id_low: Optional[int] = None
+    id_high: Optional[int] = None
+    indexed: List[Callable] = field(default_factory=list)
+    bitmap: Optional[int] = None
+    residual: Optional[Callable] = None
+    total: int = 0
+    examined: int = 0
+    returned: int = 0
+
+    def explain(self) -> str:
+        """Describe the plan and the rows it touched.
+
+        Returns:
+            str: Human readable plan
+        """
+        access = []
+        if self.bitmap is not None:
+            clauses = " and ".join(f"({clause})" for clause in self.indexed)
+            access.append(f"bitmap index {clauses}")
+        if self.id_low is not None or self.id_high is not None:
+            low = "min" if self.id_low is None else self.id_low
+            high = "max" if self.id_high is None else self.id_high
+            method = "bitmap mask" if self.bitmap is not None else "binary search on id order"
+            access.append(f"id range {low}..{high} ({method})")
+        return (
+                f"Filter:\t\t{self.predicate}\n"
+                f"Access:\t\t{'; '.join(access) or 'full scan'}\n"
+                f"Residual:\t{self.residual or 'none'}\n"
+                f"Rows:\t\texamined {self.examined} of {self.total}, returned {self.returned}"
+        )
+
+
+def _index_bitmap(node: Callable, index: TaskIndex) -> Optional[int]:
+    """Translate a predicate into bitmap operations, None if not indexable."""
+    if isinstance(node, Compare) and node.key in INDEXED_FIELDS and node.op in ("=", "!="):
+        bitmap = index.lookup(node.key, node.value)
+        return bitmap if node.op == "=" else index.ids & ~bitmap
+    if isinstance(node, InList) and node.key in INDEXED_FIELDS:
+        bitmap = 0
+        for value in node.values:
+            bitmap |= index.lookup(node.key, value)
+        return bitmap
+    if isinstance(node, Not):
+        bitmap = _index_bitmap(node.child, index)
+        return None if bitmap is None else index.ids & ~bitmap
+    if isinstance(node, (And, Or)):
+        bitmaps = [_index_bitmap(child, index) for child in node.children]
+        if any(bitmap is None for bitmap in bitmaps):
+            return None
+        return reduce(operator.and_ if isinstance(node, And) else operator.or_, bitmaps)
+    return None
+
+
+def plan_query(predicate: Callable, index: Optional[TaskIndex] = None) -> QueryPlan:
+    """Split a predicate into index lookups and a residual filter.
+
+    Every clause of the top-level conjunction is pushed down if it can be
+    answered by an index: id comparisons narrow the id range, and status,
+    priority and tag clauses, including "or" and "not" combinations of
+    them, become bitmap operations. Everything else is the residual.
+
+    Args:
+        predicate (Callable): Compiled predicate from parse_expression
+        index (Optional[TaskIndex], optional): Bitmap index of the task set.
+            Defaults to None.
+
+    Returns:
+        QueryPlan: Plan ready for execute_plan
+    """
+    plan = QueryPlan(predicate)
+    conjuncts = predicate.children if isinstance(predicate, And) else [predicate]
+    residual = []
+
+    def narrow(low: Optional[int], high: Optional[int]):
+        if low is not None:
+            plan.id_low = low if plan.id_low is None else max(plan.id_low, low)
+        if high is not None:
+            plan.id_high = high if plan.id_high is None else min(plan.id_high, high)
+
+    for clause in conjuncts:
+        bitmap = _index_bitmap(clause, index) if index is not None else None
+        if isinstance(clause, Compare) and clause.key == "id" and clause.op != "!=":
+            value = clause.value
+            bounds = {
+                "=": (value, value),
+                "<": (None, value - 1),
+                "<=": (None, value),
+                ">": (value + 1, None),
+                ">=": (value, None),
+            }
+            narrow(*bounds[clause.op])
+        elif bitmap is not None:
+            plan.indexed.append(clause)
+            plan.bitmap = bitmap if plan.bitmap is None else plan.bitmap & bitmap
+        elif isinstance(clause, InList) and clause.key == "id" and clause.values:
+            narrow(min(clause.values), max(clause.values))
+            residual.append(clause)
+        else:
+            residual.append(clause)
+
+    if residual:
+        plan.residual = residual[0] if len(residual) == 1 else And(residual)
+    return plan
+
+
+def execute_plan(plan: QueryPlan, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run a query plan over task records in id order.
+
+    Id ranges and bitmap candidates are looked up by binary search, which
+    needs the records sorted by id. If they are not, e.g. after an external
+    edit, the plan is turned into a full scan with the whole predicate.
+
+    Args:
+        plan (QueryPlan): Plan from plan_query, updated with row statistics
+        tasks (List[Dict[str, Any]]): Task records, normally sorted by id
+
+    Returns:
+        List[Dict[str, Any]]: Matching records
+    """
+    def task_id(task):
+        return task["id"]
+
+    if any(current["id"] >= following["id"] for current, following in pairwise(tasks)):
+        plan.id_low = plan.id_high = plan.bitmap = None
+        plan.indexed = []
+        plan.residual = plan.predicate
+
+    if plan.bitmap is not None:
+        candidates, position = [], 0
+        mask = id_range_mask(plan.id_low, plan.id_high, plan.bitmap.bit_length())
+        for candidate_id in iter_ids(plan.bitmap & mask):
+            position = bisect_left(tasks, candidate_id, lo=position, key=task_id)
+            if position < len(tasks) and tasks[position]["id"] == candidate_id:
+                candidates.append(tasks[position])
+    else:
+        start = 0 if plan.id_low is None else bisect_left(tasks, plan.id_low, key=task_id)
+        stop = len(tasks) if plan.id_high is None else bisect_right(tasks, plan.id_high, key=task_id)
+        candidates = tasks[start:stop]
+
+    if plan.residual is not None:
+        matches = [task for task in candidates if plan.residual(task)]
+    else:
+        matches = candidates
+
+    plan.total = len(tasks)
+    plan.examined = len(candidates)
+    plan.returned = len(matches)
+    return matches
@@ -0,0 +1,157 @@
+"""Due date scheduling module.
+
+This module answers "what is due next" queries from the sorted due index
+kept by TaskIndex, without looking at tasks that are not due. Recurring
+tasks store the due time of their current occurrence; later occurrences
+are generated lazily from a heap while the query window is being filled,
+so a recurring task never expands further than the query needs.
+
+Occurrences are counted from the stored due time rather than from the
+previous occurrence, so monthly and yearly tasks keep their day of month
+even after passing through shorter months.
+
+Functions:
+    parse_due: Validate and normalise a due time
+    shift: Compute the k-th occurrence of a recurring due time
+    next_occurrence: Find the first occurrence of a recurring due time after a moment
+    upcoming: Merge stored due times with generated recurring occurrences
+    overdue: Select stored due times before a moment
+
+Example:
+    from schedule import upcoming
+    for due, task_id in upcoming(index.due, now, limit=5):
+        print(due, task_id)
+"""
+
+import calendar
+import heapq
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+RECURRENCE_RULES = ("daily", "weekly", "monthly", "yearly")
+_PERIODS = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+_MONTHS = {"monthly": 1, "yearly": 12}
+
+DueEntry = Tuple[str, int, Optional[str]]
+
+
+def parse_due(value: str) -> str:
+    """Validate and normalise a due time.
+
+    Args:
+        value (str): ISO date or date and time, e.g. "2026-10-20" or "2026-10-20T09:30"
+
+    Returns:
+        str: Due time in ISO format
+
+    Raises:
+        ValueError: If the value is not a local ISO timestamp
+    """
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid due date {value!r}, expected an ISO date or time") from None
+    if moment.tzinfo is not None:
+        raise ValueError("Due dates must not include a time zone")
+    return moment.isoformat()
+
+
+def shift(anchor: datetime, rule: str, count: int) -> datetime:
+    """Compute the k-th occurrence of a recurring due time.
+
+    Args:
+        anchor (datetime): Stored due time (occurrence 0)
+        rule (str): Recurrence rule (daily/weekly/monthly/yearly)
+        count (int): Occurrence number
+
+    Returns:
+        datetime: Due time of the occurrence; the day of month is clamped
+            to the length of shorter months
+    """
+    if rule in _PERIODS:
+        return anchor + _PERIODS[rule] * count
+    months = anchor.month - 1 + _MONTHS[rule] * count
+    year, month = anchor.year + months // 12, months % 12 + 1
+    day = min(anchor.day, calendar.monthrange(year, month)[1])
+    return anchor.replace(year=year, month=month, day=day)
+
+
+def _first_after(anchor: datetime, rule: str, moment: datetime) -> int:
+    """Find the number of the first occurrence strictly after a moment."""
+    if moment < anchor:
+        return 1
+    if rule in _PERIODS:
+        count = (moment - anchor) // _PERIODS[rule]
+    else:
+        months = (moment.year - anchor.year) * 12 + moment.month - anchor.month
+        count = max(0, months // _MONTHS[rule] - 1)
+    while shift(anchor, rule, count) <= moment:
+        count += 1
+    return max(count, 1)
+
+
+def next_occurrence(due: str, rule: str, moment: datetime) -> str:
+    """Find the first occurrence of a recurring due time after a moment.
+
+    Args:
+        due (str): Stored due time in ISO format (occurrence 0)
+        rule (str): Recurrence rule (daily/weekly/monthly/yearly)
+        moment (datetime): Occurrences up to and including this moment are skipped
+
+    Returns:
+        str: Due time of the occurrence in ISO format, always after the stored one
+    """
+    anchor = datetime.fromisoformat(due)
+    return shift(anchor, rule, _first_after(anchor, rule, max(moment, anchor))).isoformat()
+
+
+def upcoming(entries: List[DueEntry], now: datetime, limit: int) -> Iterator[Tuple[str, int]]:
+    """Merge stored due times with generated recurring occurrences.
+
+    Stored due times are yielded in order, overdue ones included. After the
+    stored occurrence of a recurring task, its next occurrence after now is
+    pushed on a heap, and each occurrence taken from the heap pushes the
+    following one, so at most `limit` occurrences are ever generated.
+
+    Args:
+        entries (List[DueEntry]): (due, task id, rule) sorted by due time
+        now (datetime): Current time
+        limit (int): Maximum number of occurrences
+
+    Yields:
+        Tuple[str, int]: Due time in ISO format and task id
+    """
+    heap: List[Tuple[str, int, int, str, str]] = []
+    position = 0
+    for _ in range(limit):
+        stored = entries[position] if position < len(entries) else None
+        if heap and (stored is None or (heap[0][0], heap[0][1]) < (stored[0], stored[1])):
+            due, task_id, count, anchor, rule = heapq.heappop(heap)
+            following = shift(datetime.fromisoformat(anchor), rule, count + 1)
+            heapq.heappush(heap, (following.isoformat(), task_id, count + 1, anchor, rule))
+        elif stored is not None:
+            due, task_id, rule = stored
+            position += 1
+            if rule:
+                anchor = datetime.fromisoformat(due)
+                count = _first_after(anchor, rule, max(now, anchor))
+                following = shift(anchor, rule, count)
+                heapq.heappush(heap, (following.isoformat(), task_id, count, due, rule))
+        else:
+            return
+        yield due, task_id
+
+
+def overdue(entries: List[DueEntry], now: datetime) -> List[Tuple[str, int]]:
+    """Select stored due times before a moment.
+
+    Args:
+        entries (List[DueEntry]): (due, task id, rule) sorted by due time
+        now (datetime): Current time
+
+    Returns:
+        List[Tuple[str, int]]: Due time and task id of every overdue entry
+    """
+    stop = bisect_left(entries, now.isoformat(), key=lambda entry: entry[0])
+    return [(due, task_id) for due, task_id, _ in entries[:stop]]
@@ -0,0 +1,202 @@
+"""Tasks file layout helpers.
+
+The tasks file is a JSON array written with an indent of four spaces, so
+every top-level record starts on its own line with exactly four spaces
+before the opening brace. Strings are escaped by the JSON encoder and
+nested values are indented deeper, so that prefix is an unambiguous record
+boundary. This module uses it to read records by byte range without
+parsing the whole document. Tasker writes the id first in every record, so
+RECORD_ID reads it from the raw bytes of a record without decoding it.
+
+Every stored record carries a CRC32 checksum of its canonical JSON form in
+the CHECKSUM_FIELD key, added by seal_record() on save and removed again by
+unseal_record() on load.
+
+Functions:
+    record_checksum: Compute the checksum of a task record
+    seal_record: Add the checksum field to a task record
+    unseal_record: Remove the checksum field from a task record
+    has_record_layout: Check whether a file uses the indented record layout
+    iter_record_bytes: Yield raw records whose boundary lies in a byte range
+    read_range: Decode all records whose boundary lies in a byte range
+    split_ranges: Split a file into contiguous byte ranges
+    write_records: Stream task records to a file in the record layout
+"""
+
+import json
+import mmap
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+RECORD_INDENT = 4
+RECORD_BOUNDARY = b"\n" + b" " * RECORD_INDENT + b"{"
+ARRAY_END = b"\n]"
+RECORD_ID = re.compile(rb'\{\s*"id":\s*(\d+)\s*,')
+CHECKSUM_FIELD = "checksum"
+
+
+def record_checksum(record: Dict[str, Any]) -> str:
+    """Compute the checksum of a task record.
+
+    The checksum field itself is ignored, so sealed and unsealed records of
+    the same task have the same checksum.
+
+    Args:
+        record (Dict[str, Any]): Task record
+
+    Returns:
+        str: CRC32 of the canonical JSON form as eight hex digits
+    """
+    fields = {key: value for key, value in record.items() if key != CHECKSUM_FIELD}
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+    return f"{zlib.crc32(canonical.encode()):08x}"
+
+
+def seal_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a task record with its checksum field set.
+
+    Args:
+        record (Dict[str, Any]): Task record
+
+    Returns:
+        Dict[str, Any]: Record ready to be stored
+    """
+    sealed = {key: value for key, value in record.items() if key != CHECKSUM_FIELD}
+    sealed[CHECKSUM_FIELD] = record_checksum(sealed)
+    return sealed
+
+
+def unseal_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove the checksum field from a stored task record in place.
+
+    Args:
+        record (Dict[str, Any]): Stored task record
+
+    Returns:
+        Dict[str, Any]: The same record without the checksum field
+    """
+    record.pop(CHECKSUM_FIELD, None)
+    return record
+
+
+def has_record_layout(path: Path) -> bool:
+    """Check whether a tasks file uses the indented record layout.
+
+    Args:
+        path (Path): Path to the tasks file
+
+    Returns:
+        bool: True for an empty array or an array written with record indentation
+    """
+    with open(path, "rb") as f:
+        head = f.read(len(RECORD_BOUNDARY) + 1)
+    return head == b"[" + RECORD_BOUNDARY or head.strip() == b"[]"
+
+
+def iter_record_bytes(path: Path, start: int = 0, end: int = -1) -> Iterator[Tuple[int, bytes]]:
+    """Yield raw records whose boundary starts inside a byte range.
+
+    A record belongs to the range containing the newline that precedes it,
+    so adjacent ranges never yield the same record. The file is memory
+    mapped and records are yielded one by one, keeping memory use
+    independent of the file size. Every record but the last one keeps the
+    comma that separates it from the next.
+
+    Args:
+        path (Path): Path to the tasks file
+        start (int, optional): First byte of the range. Defaults to 0.
+        end (int, optional): End of the range (exclusive). Defaults to -1,
+            meaning the end of the file.
+
+    Yields:
+        Tuple[int, bytes]: Byte offset of the record and its JSON text
+    """
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = size if end < 0 else min(end, size)
+            head = data.find(RECORD_BOUNDARY, start)
+            while 0 <= head < end:
+                following = data.find(RECORD_BOUNDARY, head + 1)
+                stop = following if following >= 0 else data.find(ARRAY_END, head + 1)
+                if stop < 0:
+                    stop = size
+                brace = head + len(RECORD_BOUNDARY) - 1
+                yield brace, data[brace:stop].rstrip()
+                head = following
+
+
+def read_range(path: Path, start: int = 0, end: int = -1) -> List[Dict[str, Any]]:
+    """Decode all records whose boundary starts inside a byte range.
+
+    The records of a range are contiguous in the file, so they are decoded
+    with a single JSON parse instead of one parse per record.
+
+    Args:
+        path (Path): Path to the tasks file
+        start (int, optional): First byte of the range. Defaults to 0.
+        end (int, optional): End of the range (exclusive). Defaults to -1,
+            meaning the end of the file.
+
+    Returns:
+        List[Dict[str, Any]]: Records of the range in storage order
+    """
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = size if end < 0 else min(end, size)
+            first = data.find(RECORD_BOUNDARY, start)
+            if not 0 <= first < end:
+                return []
+            stop = data.find(RECORD_BOUNDARY, end)
+            if stop < 0:
+                stop = data.find(ARRAY_END, first + 1)
+            if stop < 0:
+                stop = size
+            return json.loads(b"[" + data[first + 1:stop].rstrip().rstrip(b",") + b"]")
+
+
+def split_ranges(path: Path, parts: int) -> List[Tuple[int, int]]:
+    """Split a file into contiguous byte ranges of similar size.
+
+    Args:
+        path (Path): Path to the file
+        parts (int): Desired number of ranges
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) pairs covering the whole file
+    """
+    size = Path(path).stat().st_size
+    step = max(1, -(-size // max(1, parts)))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def write_records(path: Path, records: Iterable[Dict[str, Any]]) -> int:
+    """Stream task records to a file in the record layout.
+
+    The output is identical to json.dump(records, f, indent=4) but records
+    are encoded one at a time, so the input can be any iterable.
+
+    Args:
+        path (Path): Destination file, overwritten if it exists
+        records (Iterable[Dict[str, Any]]): Records to write
+
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    with open(path, "w") as f:
+        for record in records:
+            f.write(",\n    " if count else "[\n    ")
+            f.write(json.dumps(record, indent=RECORD_INDENT).replace("\n", "\n    "))
+            count += 1
+        f.write("\n]" if count else "[]")
+    return count
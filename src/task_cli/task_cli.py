@@ -11,20 +11,40 @@ Classes:
 Example:
     python task_cli.py list
     python task_cli.py list todo
+    python task_cli.py list --where "status = todo and description ~ 'deploy'"
+    python task_cli.py list --where "id >= 10" --explain
     python task_cli.py add "Task with description"
     python task_cli.py edit 1 "New description for task 1"
     python task_cli.py mark-progress 1
     python task_cli.py mark-done 1
     python task_cli.py mark-todo 1
+    python task_cli.py set-priority 1 high
+    python task_cli.py tag 1 infra ops
+    python task_cli.py untag 1 ops
+    python task_cli.py set-due 1 2026-10-20T09:00 weekly
+    python task_cli.py clear-due 1
+    python task_cli.py due --next 5
+    python task_cli.py due --overdue
     python task_cli.py rm 1
+    python task_cli.py search "deploy"
+    python task_cli.py stats
+    python task_cli.py watch in-progress
+    python task_cli.py fsck --incremental
+    python task_cli.py fsck --repair
+    python task_cli.py backup --keep 5
+    python task_cli.py backups
+    python task_cli.py restore 3
 
 """
 
 import logging
 import sys
-from typing import AnyStr, Literal
+import time
+from typing import AnyStr, Literal, Optional
 
-from .tasker import Tasker
+from .backup import BackupPoint, backup_database, list_backups, restore_database
+from .integrity import FsckReport, check_database, repair_database
+from .tasker import TaskChanges, Tasker
 
 # Configure logging
 logging.basicConfig(
@@ -36,7 +56,9 @@ logger = logging.getLogger(__name__)
 
 TaskerCommand = (
         Literal[
-            "add", "list", "edit", "rm", "remove", "mark-todo", "mark-progress", "mark-done", "help"
+            "add", "list", "search", "stats", "edit", "rm", "remove", "mark-todo", "mark-progress",
+            "mark-done", "set-priority", "tag", "untag", "set-due", "clear-due", "due", "watch",
+            "fsck", "backup", "backups", "restore", "help"
         ] | None
 )
 
@@ -44,8 +66,8 @@ TaskerCommand = (
 def ticket_print(tasklist: list):
     """Print task details in a formatted way.
 
-    Displays each task's ID, description, status, creation time,
-    and last update time in a readable format.
+    Displays each task's ID, description, status, priority, tags, due date,
+    creation time, and last update time in a readable format.
 
     Args:
         tasklist (list[Task]): List of Task objects to display.
@@ -54,11 +76,118 @@ def ticket_print(tasklist: list):
         print(
                 f"#Task {task.id}:\t{task.description}\n"
                 f"Status:\t\t`{task.status}`\n"
+                f"Priority:\t`{task.priority}`\n"
+                f"Tags:\t\t{', '.join(task.tags) or '-'}\n"
+                f"Due:\t\t{task.due or '-'}"
+                f"{f' ({task.recurrence})' if task.recurrence else ''}\n"
                 f"Created:\t{task.createdAt}\n"
                 f"Updated:\t{task.updatedAt}\n"
         )
 
 
+def stats_print(counts: dict):
+    """Print the number of tasks per status.
+
+    Args:
+        counts (dict[str, int]): Task counts keyed by status.
+    """
+    for status in ("todo", "in-progress", "done"):
+        print(f"{status}:\t{counts.get(status, 0)}")
+    print(f"total:\t{sum(counts.values())}")
+
+
+def fsck_print(report: FsckReport):
+    """Print the result of an integrity check.
+
+    Args:
+        report (FsckReport): Report returned by check_database.
+    """
+    for issue in report.errors:
+        print(f"error:\t{issue}")
+    for issue in report.warnings:
+        print(f"warning:\t{issue}")
+    print(
+            f"Checked {report.records} records ({report.skipped} unchanged): "
+            f"{len(report.errors)} errors, {len(report.warnings)} warnings"
+    )
+
+
+def backups_print(points: list):
+    """Print the backup points of the tasks file.
+
+    Args:
+        points (list[BackupPoint]): Backup points returned by list_backups.
+    """
+    for point in points:
+        print(f"{point.point}:\t{point.created}\t{point.records} records\t{point.size} bytes")
+    print(f"{len(points)} backup points")
+
+
+def backup_print(point: BackupPoint, stored: int):
+    """Print the result of a backup.
+
+    Args:
+        point (BackupPoint): Backup point returned by backup_database.
+        stored (int): Number of newly stored blocks.
+    """
+    print(
+            f"Backup point {point.point}: {point.records} records, "
+            f"{stored} of {len(point.blocks)} blocks stored"
+    )
+
+
+def watch_tasks(
+        tasker: Tasker,
+        status: Optional[str] = None,
+        interval: float = 2.0,
+        iterations: Optional[int] = None,
+):
+    """Keep a live view of tasks, printing only what changed.
+
+    The first poll prints every matching task; later polls print tasks that
+    were added or updated and a short notice for tasks that left the view.
+    Between polls the process sleeps, and an unchanged file costs one stat call.
+
+    Args:
+        tasker (Tasker): Tasker instance to watch.
+        status (Optional[str], optional): Only show tasks with this status.
+            Defaults to None.
+        interval (float, optional): Seconds between polls. Defaults to 2.0.
+        iterations (Optional[int], optional): Stop after this many polls.
+            Defaults to None, which watches until interrupted.
+    """
+    visible = set()
+
+    def render(changes: TaskChanges):
+        shown = []
+        for task in changes.added + changes.updated:
+            if status is None or task.status == status:
+                visible.add(task.id)
+                shown.append(task)
+            elif task.id in visible:
+                visible.discard(task.id)
+                print(f"#Task {task.id}:\tleft `{status}`\n")
+        ticket_print(sorted(shown, key=lambda task: task.id))
+        for task_id in changes.removed:
+            if task_id in visible:
+                visible.discard(task_id)
+                print(f"#Task {task_id}:\tremoved\n")
+
+    tasker.subscribe(render)
+    polls = 0
+    try:
+        while True:
+            tasker.poll_changes()
+            polls += 1
+            if iterations is not None and polls >= iterations:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tasker.unsubscribe(render)
+
+
 def usage_print():
     """Print command-line usage information.
 
@@ -86,15 +215,33 @@ def parse_arguments(line_input: list, tasker: Tasker = Tasker()):
 
     Returns:
         List[Task]: List of tasks after command execution.
-            For 'list' commands, returns filtered tasks.
+            For 'list' and 'search' commands, returns filtered tasks.
+            For 'list --where ... --explain', returns an empty list after printing the plan.
+            For 'due' commands, returns due tasks with the due time of each occurrence.
+            For 'stats' commands, returns an empty list after printing counts.
+            For 'fsck' commands, returns an empty list after printing the report.
+            For 'backup' and 'backups' commands, returns an empty list after printing the points.
+            For 'restore' commands, returns all tasks of the restored file.
+            For 'watch' commands, returns an empty list once watching stops.
             For other commands, returns all tasks.
     """
     status_filter = None
+    search = None
     match line_input:
         case ["list"]:
             pass
+        case ["list", "--where", where]:
+            return tasker.query_tasks(where)[0]
+        case ["list", "--where", where, "--explain"] | ["list", "--explain", "--where", where]:
+            print(tasker.query_tasks(where)[1].explain())
+            return []
         case ["list", status]:
             status_filter = status
+        case ["search", text]:
+            search = text
+        case ["stats"]:
+            stats_print(tasker.count_tasks())
+            return []
         case ["add", description]:
             tasker.add_task(description)
         case ["edit", task_id, description]:
@@ -105,12 +252,59 @@ def parse_arguments(line_input: list, tasker: Tasker = Tasker()):
             tasker.edit_task_status(int(task_id), "in-progress")
         case ["mark-done", task_id]:
             tasker.edit_task_status(int(task_id), "done")
+        case ["set-priority", task_id, priority]:
+            tasker.edit_task_priority(int(task_id), priority)
+        case ["tag", task_id, *tags] if tags:
+            tasker.tag_task(int(task_id), tags)
+        case ["untag", task_id, *tags] if tags:
+            tasker.untag_task(int(task_id), tags)
+        case ["set-due", task_id, due]:
+            tasker.edit_task_due(int(task_id), due)
+        case ["set-due", task_id, due, recurrence]:
+            tasker.edit_task_due(int(task_id), due, recurrence)
+        case ["clear-due", task_id]:
+            tasker.edit_task_due(int(task_id), None)
+        case ["due"]:
+            return tasker.due_tasks()
+        case ["due", "--next", limit]:
+            return tasker.due_tasks(int(limit))
+        case ["due", "--overdue"]:
+            return tasker.due_tasks(None, overdue_only=True)
+        case ["due", "--next", limit, "--overdue"] | ["due", "--overdue", "--next", limit]:
+            return tasker.due_tasks(int(limit), overdue_only=True)
         case ["rm" | "remove", task_id]:
             tasker.remove_task(int(task_id))
+        case ["fsck"]:
+            fsck_print(check_database(tasker.db_file))
+            return []
+        case ["fsck", "--incremental"]:
+            fsck_print(check_database(tasker.db_file, incremental=True))
+            return []
+        case ["fsck", "--repair"]:
+            salvaged, dropped = repair_database(tasker.db_file)
+            print(f"Salvaged {salvaged} records, dropped {dropped}")
+            return []
+        case ["backup"]:
+            backup_print(*backup_database(tasker.db_file))
+            return []
+        case ["backup", "--keep", keep]:
+            backup_print(*backup_database(tasker.db_file, int(keep)))
+            return []
+        case ["backups"]:
+            backups_print(list_backups(tasker.db_file))
+            return []
+        case ["restore", point]:
+            restore_database(tasker.db_file, int(point))
+        case ["watch"]:
+            watch_tasks(tasker)
+            return []
+        case ["watch", status]:
+            watch_tasks(tasker, status)
+            return []
         case _:
             usage_print()
             exit(0)
-    return tasker.list_tasks(status_filter)
+    return tasker.list_tasks(status_filter, search)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ the Tasker class for managing tasks.
 
 Classes:
     Task: A dataclass representing a single task
+    TaskChanges: A dataclass describing the difference between two task snapshots
     Tasker: The main task management class
 
 Example:
@@ -18,12 +19,30 @@ Example:
 """
 
 import json
-from dataclasses import asdict, dataclass
+import os
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+from .expression import parse_expression
+from .index import INDEX_SUFFIX, TaskIndex
+from .query import (
+    QueryPlan,
+    count_file,
+    count_tasks,
+    execute_plan,
+    filter_tasks,
+    plan_query,
+    scan_file,
+    use_parallel_scan,
+)
+from .schedule import RECURRENCE_RULES, next_occurrence, overdue, parse_due, upcoming
+from .storage import seal_record, unseal_record
 
 TaskStatus = Literal["todo", "in-progress", "done"] | None
+TaskPriority = Literal["low", "medium", "high"]
+TASK_PRIORITIES = ("low", "medium", "high")
 
 
 @dataclass
@@ -36,6 +55,11 @@ class Task:
         status (str): Current status (todo/in-progress/done)
         createdAt (str): ISO format timestamp of creation
         updatedAt (Optional[str]): ISO format timestamp of last update, None if never updated
+        priority (str): Priority level (low/medium/high)
+        tags (List[str]): Tags attached to the task
+        due (Optional[str]): ISO format due time, None if the task has no due date
+        recurrence (Optional[str]): Recurrence rule (daily/weekly/monthly/yearly),
+            None for one-off tasks
     """
 
     id: int
@@ -43,6 +67,28 @@ class Task:
     status: str = "todo"
     createdAt: str = ""
     updatedAt: Optional[str] = None
+    priority: str = "medium"
+    tags: List[str] = field(default_factory=list)
+    due: Optional[str] = None
+    recurrence: Optional[str] = None
+
+
+@dataclass
+class TaskChanges:
+    """Difference between two snapshots of the tasks file.
+
+    Attributes:
+        added (List[Task]): Tasks that appeared since the previous snapshot
+        updated (List[Task]): Tasks whose stored fields changed
+        removed (List[int]): IDs of tasks that disappeared
+    """
+
+    added: List[Task] = field(default_factory=list)
+    updated: List[Task] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
 
 
 class Tasker:
@@ -50,10 +96,12 @@ class Tasker:
 
     This class provides methods for managing tasks, including creating,
     listing, editing, and updating task status. Tasks are persisted to
-    a JSON file.
+    a JSON file. Bitmap indexes over status, priority and tags are created
+    in a ".index" file next to it by the first query that uses them.
 
     Attributes:
         db_file (Path): Path to the JSON file storing tasks
+        index_file (Path): Path to the bitmap index file
 
     Example:
         tasker = Tasker("tasks.json")
@@ -69,7 +117,11 @@ class Tasker:
                 Defaults to "tasks.json".
         """
         self.db_file = self._get_db_file(tasks_file)
+        self.index_file = self.db_file.with_name(self.db_file.name + INDEX_SUFFIX)
         self._ensure_tasks_file()
+        self._subscribers: List[Callable[[TaskChanges], None]] = []
+        self._snapshot: Dict[int, Dict[str, Any]] = {}
+        self._signature: Optional[Tuple[int, int, int]] = None
 
     @staticmethod
     def _get_timestamp() -> str:
@@ -107,20 +159,66 @@ class Tasker:
     def _save_tasks(self, tasks: List[Dict[str, Any]]) -> None:
         """Save tasks to file.
 
+        Each record is stored with a checksum, see storage.seal_record.
+        The file is written under a temporary name and moved into place, so
+        readers in other processes never see a partially written file.
+        The bitmap index is rebuilt if it has been created by a query.
+
         Args:
             tasks (List[Dict[str, Any]]): List of task dictionaries
         """
-        with self.db_file.open("w") as f:  # type: Any
-            json.dump(tasks, f, indent=4)
+        partial = self.db_file.with_name(self.db_file.name + ".partial")
+        with partial.open("w") as f:  # type: Any
+            json.dump([seal_record(task) for task in tasks], f, indent=4)
+        os.replace(partial, self.db_file)
+        if self.index_file.exists():
+            TaskIndex.build(tasks, self._stat_signature()).save(self.index_file)
 
     def _load_tasks(self) -> List[Dict[str, Any]]:
         """Load tasks from file.
 
+        Records written before priorities, tags and due dates existed get the defaults.
+
         Returns:
             List[Dict[str, Any]]: List of task dictionaries
         """
         with self.db_file.open("r") as f:
-            return json.load(f)
+            tasks = [unseal_record(task) for task in json.load(f)]
+        for task in tasks:
+            task.setdefault("priority", "medium")
+            task.setdefault("tags", [])
+            task.setdefault("due", None)
+            task.setdefault("recurrence", None)
+        return tasks
+
+    def _load_index(self, tasks: List[Dict[str, Any]]) -> TaskIndex:
+        """Load the bitmap index, rebuilding it if the tasks file changed.
+
+        Args:
+            tasks (List[Dict[str, Any]]): Current task dictionaries
+
+        Returns:
+            TaskIndex: Index matching the tasks file
+        """
+        signature = list(self._stat_signature())
+        index = TaskIndex.load(self.index_file)
+        if index is None or index.signature != signature:
+            index = TaskIndex.build(tasks, signature)
+            index.save(self.index_file)
+        return index
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Get a cheap fingerprint of the tasks file.
+
+        Returns:
+            Optional[Tuple[int, int, int]]: Inode, size and modification time
+                in nanoseconds, or None if the file is missing
+        """
+        try:
+            stat = self.db_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
 
     def _get_next_id(self):
         """Generate the next available task ID.
@@ -146,42 +244,127 @@ class Tasker:
                 return Task(**task)
         raise ValueError(f"Task with id {task_id} not found")
 
-    def add_task(self, description: str) -> Task:
+    def add_task(
+            self, description: str, priority: str = "medium", tags: Optional[List[str]] = None
+    ) -> Task:
         """Add a new task.
 
         Args:
             description (str): Task description
+            priority (str, optional): Priority (low/medium/high). Defaults to "medium".
+            tags (Optional[List[str]], optional): Tags to attach. Defaults to None.
 
         Returns:
             Task: The newly created task
+
+        Raises:
+            ValueError: If priority or a tag is invalid
         """
+        if priority not in TASK_PRIORITIES:
+            raise ValueError("Priority must be low, medium, or high")
         tasks = self._load_tasks()
 
         task = Task(
                 id=self._get_next_id(),
                 description=description,
                 createdAt=self._get_timestamp(),
+                priority=priority,
+                tags=self._clean_tags(tags or []),
         )
 
         tasks.append(asdict(task))
         self._save_tasks(tasks)
         return task
 
-    def list_tasks(self, status: Optional[str] = None) -> List[Task]:
-        """List tasks, optionally filtered by status.
+    def list_tasks(self, status: Optional[str] = None, search: Optional[str] = None) -> List[Task]:
+        """List tasks, optionally filtered by status and description text.
+
+        Large tasks files are scanned in a process pool, see query.scan_file.
 
         Args:
             status (Optional[str], optional): Filter by status.
                 Defaults to None.
+            search (Optional[str], optional): Case-insensitive text the
+                description must contain. Defaults to None.
 
         Returns:
             List[Task]: List of matching tasks
         """
-        tasks = self._load_tasks()
-        if status:
-            tasks = [task for task in tasks if task["status"] == status]
+        if (status or search) and use_parallel_scan(self.db_file):
+            tasks = scan_file(self.db_file, status, search)
+        else:
+            tasks = self._load_tasks()
+            if status or search:
+                tasks = filter_tasks(tasks, status, search)
         return [Task(**task) for task in tasks]
 
+    def query_tasks(self, where: str) -> Tuple[List[Task], QueryPlan]:
+        """List tasks matching a filter expression.
+
+        The expression is compiled once and planned with query.plan_query,
+        which answers status, priority and tag clauses from the bitmap index.
+        See the expression module for the syntax.
+
+        Args:
+            where (str): Filter expression,
+                e.g. "status in (todo, in-progress) and description ~ 'deploy'"
+
+        Returns:
+            Tuple[List[Task], QueryPlan]: Matching tasks and the executed plan
+
+        Raises:
+            ValueError: If the expression is invalid
+        """
+        predicate = parse_expression(where)
+        tasks = self._load_tasks()
+        plan = plan_query(predicate, self._load_index(tasks))
+        tasks = execute_plan(plan, tasks)
+        return [Task(**task) for task in tasks], plan
+
+    def due_tasks(
+            self, limit: Optional[int] = 10, overdue_only: bool = False, now: Optional[datetime] = None
+    ) -> List[Task]:
+        """List the next due or overdue tasks.
+
+        Due times come from the sorted due index, so tasks without a due date
+        are never looked at. Recurring tasks appear once per occurrence; their
+        future occurrences are generated lazily, up to the limit.
+
+        Args:
+            limit (Optional[int], optional): Maximum number of occurrences.
+                Defaults to 10; None lists every overdue task.
+            overdue_only (bool, optional): Only list occurrences due before now.
+                Defaults to False.
+            now (Optional[datetime], optional): Current time. Defaults to datetime.now().
+
+        Returns:
+            List[Task]: Tasks in due order, with due set to the occurrence time
+        """
+        now = now or datetime.now()
+        tasks = self._load_tasks()
+        entries = self._load_index(tasks).due
+        if overdue_only:
+            occurrences = overdue(entries, now)[:limit]
+        else:
+            occurrences = list(upcoming(entries, now, len(entries) if limit is None else limit))
+
+        by_id = {task["id"]: task for task in tasks}
+        return [replace(Task(**by_id[task_id]), due=due) for due, task_id in occurrences]
+
+    def count_tasks(self, search: Optional[str] = None) -> Dict[str, int]:
+        """Count tasks per status.
+
+        Args:
+            search (Optional[str], optional): Only count tasks whose description
+                contains this text. Defaults to None.
+
+        Returns:
+            Dict[str, int]: Number of tasks for each status present
+        """
+        if use_parallel_scan(self.db_file):
+            return count_file(self.db_file, search)
+        return count_tasks(self._load_tasks(), search)
+
     def edit_task_description(self, task_id: int, new_description: str) -> Task:
         """Edit task description.
 
@@ -204,12 +387,20 @@ class Tasker:
                 return Task(**task)
         raise ValueError(f"Task with id {task_id} not found")
 
-    def edit_task_status(self, task_id: int, new_status: str) -> Task:
+    def edit_task_status(
+            self, task_id: int, new_status: str, now: Optional[datetime] = None
+    ) -> Task:
         """Update task status.
 
+        Marking a recurring task done completes its current occurrence: the
+        task stays open as todo and its due time moves to the first occurrence
+        after both now and the completed one. A day of month clamped to a
+        shorter month is kept for later occurrences.
+
         Args:
             task_id (int): ID of task to update
             new_status (str): New status (todo/in-progress/done)
+            now (Optional[datetime], optional): Current time. Defaults to datetime.now().
 
         Returns:
             Task: Updated task
@@ -223,12 +414,144 @@ class Tasker:
         tasks = self._load_tasks()
         for task in tasks:
             if task["id"] == task_id:
+                if new_status == "done" and task["recurrence"]:
+                    task["due"] = next_occurrence(
+                            task["due"], task["recurrence"], now or datetime.now()
+                    )
+                    new_status = "todo"
                 task["status"] = new_status
                 task["updatedAt"] = self._get_timestamp()
                 self._save_tasks(tasks)
                 return Task(**task)
         raise ValueError(f"Task with id {task_id} not found")
 
+    def edit_task_priority(self, task_id: int, new_priority: str) -> Task:
+        """Update task priority.
+
+        Args:
+            task_id (int): ID of task to update
+            new_priority (str): New priority (low/medium/high)
+
+        Returns:
+            Task: Updated task
+
+        Raises:
+            ValueError: If task_id not found or invalid priority
+        """
+        if new_priority not in TASK_PRIORITIES:
+            raise ValueError("Priority must be low, medium, or high")
+
+        tasks = self._load_tasks()
+        for task in tasks:
+            if task["id"] == task_id:
+                task["priority"] = new_priority
+                task["updatedAt"] = self._get_timestamp()
+                self._save_tasks(tasks)
+                return Task(**task)
+        raise ValueError(f"Task with id {task_id} not found")
+
+    @staticmethod
+    def _clean_tags(tags: List[str]) -> List[str]:
+        """Strip tags and drop duplicates, keeping their order.
+
+        Args:
+            tags (List[str]): Tags as given by the user
+
+        Returns:
+            List[str]: Cleaned tags
+
+        Raises:
+            ValueError: If a tag is empty or contains whitespace or commas
+        """
+        cleaned = []
+        for tag in tags:
+            tag = tag.strip()
+            if not tag or "," in tag or any(char.isspace() for char in tag):
+                raise ValueError(f"Invalid tag {tag!r}")
+            if tag not in cleaned:
+                cleaned.append(tag)
+        return cleaned
+
+    def tag_task(self, task_id: int, tags: List[str]) -> Task:
+        """Attach tags to a task.
+
+        Args:
+            task_id (int): ID of task to update
+            tags (List[str]): Tags to attach
+
+        Returns:
+            Task: Updated task
+
+        Raises:
+            ValueError: If task_id not found or a tag is invalid
+        """
+        tags = self._clean_tags(tags)
+        tasks = self._load_tasks()
+        for task in tasks:
+            if task["id"] == task_id:
+                task["tags"] = self._clean_tags(task["tags"] + tags)
+                task["updatedAt"] = self._get_timestamp()
+                self._save_tasks(tasks)
+                return Task(**task)
+        raise ValueError(f"Task with id {task_id} not found")
+
+    def untag_task(self, task_id: int, tags: List[str]) -> Task:
+        """Remove tags from a task.
+
+        Args:
+            task_id (int): ID of task to update
+            tags (List[str]): Tags to remove
+
+        Returns:
+            Task: Updated task
+
+        Raises:
+            ValueError: If task_id not found
+        """
+        tasks = self._load_tasks()
+        for task in tasks:
+            if task["id"] == task_id:
+                task["tags"] = [tag for tag in task["tags"] if tag not in tags]
+                task["updatedAt"] = self._get_timestamp()
+                self._save_tasks(tasks)
+                return Task(**task)
+        raise ValueError(f"Task with id {task_id} not found")
+
+    def edit_task_due(
+            self, task_id: int, due: Optional[str], recurrence: Optional[str] = None
+    ) -> Task:
+        """Set or clear the due date and recurrence of a task.
+
+        Args:
+            task_id (int): ID of task to update
+            due (Optional[str]): ISO date or time, None to clear the due date
+            recurrence (Optional[str], optional): Recurrence rule
+                (daily/weekly/monthly/yearly). Defaults to None.
+
+        Returns:
+            Task: Updated task
+
+        Raises:
+            ValueError: If task_id not found, or due or recurrence is invalid
+        """
+        if due is not None:
+            due = parse_due(due)
+        if recurrence is not None:
+            if recurrence not in RECURRENCE_RULES:
+                raise ValueError("Recurrence must be daily, weekly, monthly, or yearly")
+            if due is None:
+                raise ValueError("Recurring tasks need a due date")
+
+        tasks = self._load_tasks()
+        for task in tasks:
+            if task["id"] == task_id:
+                task["due"] = due
+                task["recurrence"] = recurrence
+                task["updatedAt"] = self._get_timestamp()
+                self._save_tasks(tasks)
+                return Task(**task)
+        raise ValueError(f"Task with id {task_id} not found")
+
     def remove_task(self, task_id: int) -> Task:
         """Update task status.
 
@@ -249,3 +572,60 @@ class Tasker:
                 self._save_tasks(tasks)
                 return Task(**task)
         raise ValueError(f"Task with id {task_id} not found")
+
+    def subscribe(self, callback: Callable[[TaskChanges], None]) -> None:
+        """Register a callback for task changes.
+
+        The callback is invoked by poll_changes() with a TaskChanges
+        instance whenever the tasks file differs from the last snapshot.
+
+        Args:
+            callback (Callable[[TaskChanges], None]): Function to notify
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[TaskChanges], None]) -> None:
+        """Remove a previously registered callback.
+
+        Args:
+            callback (Callable[[TaskChanges], None]): Function to remove
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def poll_changes(self) -> TaskChanges:
+        """Detect changes made to the tasks file since the last poll.
+
+        The file is only re-read when its stat fingerprint (inode, size,
+        modification time) has changed, so polling an idle file costs a
+        single stat call. The first poll reports every task as added. A file
+        that is missing or cannot be decoded, e.g. while another program is
+        still writing it, is reported as unchanged and read again next poll.
+
+        Returns:
+            TaskChanges: Added, updated and removed tasks; empty if nothing changed
+        """
+        signature = self._stat_signature()
+        if signature == self._signature:
+            return TaskChanges()
+
+        try:
+            current = {task["id"]: task for task in self._load_tasks()}
+        except (OSError, ValueError):
+            return TaskChanges()
+        changes = TaskChanges()
+        for task_id, task in current.items():
+            previous = self._snapshot.get(task_id)
+            if previous is None:
+                changes.added.append(Task(**task))
+            elif previous != task:
+                changes.updated.append(Task(**task))
+        changes.removed = [task_id for task_id in self._snapshot if task_id not in current]
+
+        self._snapshot = current
+        self._signature = signature
+        if changes:
+            for callback in list(self._subscribers):
+                callback(changes)
+        return changes
@@ -1,10 +1,19 @@
 """Pytest test suite for task_cli module."""
 
 import json
+from datetime import datetime
 
 import pytest
 
-from task_cli.task_cli import parse_arguments
+from task_cli import backup
+from task_cli.backup import backup_database, list_backups, prune_backups, restore_database
+from task_cli.expression import parse_expression
+from task_cli.index import TaskIndex, id_range_mask, iter_ids
+from task_cli.integrity import check_database, repair_database
+from task_cli.query import count_file, scan_file
+from task_cli.schedule import shift
+from task_cli.storage import read_range, split_ranges
+from task_cli.task_cli import parse_arguments, watch_tasks
 from task_cli.tasker import Task, Tasker
 
 
@@ -150,6 +159,641 @@ class TestTaskStatus:
             tasker.edit_task_status(task.id, "invalid_status")
 # endregion
 
+# region Query Tests
+class TestQuery:
+    """Test search, aggregation and the parallel query engine."""
+
+    def test_search_tasks(self, populated_tasker):
+        """Test case-insensitive description search combined with status."""
+        populated_tasker.add_task("Deploy the release")
+        assert [task.id for task in populated_tasker.list_tasks(search="deploy")] == [4]
+        assert populated_tasker.list_tasks("done", search="deploy") == []
+
+    def test_count_tasks(self, populated_tasker):
+        """Test per-status aggregation."""
+        assert populated_tasker.count_tasks() == {"todo": 1, "done": 1, "in-progress": 1}
+        assert populated_tasker.count_tasks(search="test3") == {"in-progress": 1}
+
+    def test_parse_arguments_search(self, populated_tasker):
+        """Test parsing search command."""
+        result = parse_arguments(["search", "TEST2"], populated_tasker)
+        assert [task.description for task in result] == ["Test2"]
+
+    def test_ranges_cover_every_record_once(self, tasker):
+        """Test that byte ranges split the file at record boundaries."""
+        for index in range(25):
+            tasker.add_task(f"Task {index}")
+        for parts in (1, 3, 7, 100):
+            ids = [
+                task["id"]
+                for start, end in split_ranges(tasker.db_file, parts)
+                for task in read_range(tasker.db_file, start, end)
+            ]
+            assert ids == list(range(1, 26))
+
+    def test_parallel_scan_matches_serial(self, tasker):
+        """Test that the process pool returns the serial result in id order."""
+        for index in range(30):
+            task = tasker.add_task(f"Task {index}")
+            if index % 3 == 0:
+                tasker.edit_task_status(task.id, "done")
+
+        expected = tasker.list_tasks("done", search="task 1")
+        result = scan_file(tasker.db_file, "done", "task 1", workers=2)
+        assert [Task(**task) for task in result] == expected
+        assert count_file(tasker.db_file, workers=2) == tasker.count_tasks()
+# endregion
+
+# region Filter Expression Tests
+class TestFilterExpressions:
+    """Test compiled filter expressions and the query planner."""
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("status = todo", [1]),
+        ("status in (todo, in-progress)", [1, 3]),
+        ("description ~ 'TEST'", [1, 2, 3]),
+        ('description = "Test2"', [2]),
+        ("not status = done and id > 1", [3]),
+        ("status = done or (id <= 1 and description ~ test)", [1, 2]),
+        ("created > 2000-01-01 and updated != 2000-01-01", [1, 2, 3]),
+        ("id in (1, 3) and not (status = todo)", [3]),
+    ])
+    def test_query_tasks(self, populated_tasker, expression, expected):
+        """Test evaluating expressions against stored tasks."""
+        tasks, _ = populated_tasker.query_tasks(expression)
+        assert [task.id for task in tasks] == expected
+
+    @pytest.mark.parametrize("expression", [
+        "", "status", "status = ", "priority > high", "tag ~ infra", "id = abc", "status ~ todo",
+        "updated > yesterday", "(status = todo", "status = todo done", "status = todo & id = 1",
+    ])
+    def test_invalid_expressions(self, expression):
+        """Test that malformed expressions are rejected."""
+        with pytest.raises(ValueError):
+            parse_expression(expression)
+
+    def test_id_range_pushdown(self, tasker):
+        """Test that id clauses narrow the rows examined."""
+        for index in range(10):
+            tasker.add_task(f"Task {index}")
+        tasks, plan = tasker.query_tasks("id >= 3 and id < 7 and description ~ 'task'")
+        assert [task.id for task in tasks] == [3, 4, 5, 6]
+        assert (plan.id_low, plan.id_high) == (3, 6)
+        assert (plan.examined, plan.total, plan.returned) == (4, 10, 4)
+        assert str(plan.residual) == "description ~ 'task'"
+
+    def test_disjunction_is_not_pushed_down(self, populated_tasker):
+        """Test that clauses below "or" stay in the residual predicate."""
+        _, plan = populated_tasker.query_tasks("id = 1 or status = done")
+        assert plan.id_low is None and plan.id_high is None
+        assert plan.examined == 3
+
+    def test_parse_arguments_where(self, populated_tasker, capsys):
+        """Test parsing list --where with and without --explain."""
+        result = parse_arguments(["list", "--where", "status != todo"], populated_tasker)
+        assert [task.id for task in result] == [2, 3]
+
+        assert parse_arguments(["list", "--where", "id = 2", "--explain"], populated_tasker) == []
+        output = capsys.readouterr().out
+        assert "id range 2..2" in output
+        assert "examined 1 of 3, returned 1" in output
+# endregion
+
+# region Priority and Tag Tests
+@pytest.fixture
+def tagged_tasker(tasker):
+    """Create a Tasker instance with priorities and tags."""
+    tasker.add_task("Upgrade cluster", priority="high", tags=["infra", "ops"])
+    tasker.add_task("Write docs", tags=["docs"])
+    tasker.add_task("Rotate keys", priority="high", tags=["infra"])
+    tasker.add_task("Fix typo", priority="low")
+    tasker.edit_task_status(3, "done")
+    return tasker
+
+
+class TestPriorityAndTags:
+    """Test task priorities, tags and bitmap index queries."""
+
+    def test_defaults(self, tasker):
+        """Test default priority and tags of a new task."""
+        task = tasker.add_task("Test task")
+        assert task.priority == "medium"
+        assert task.tags == []
+
+    def test_edit_priority_and_tags(self, tasker):
+        """Test updating priority and tags."""
+        task = tasker.add_task("Test task")
+        assert tasker.edit_task_priority(task.id, "high").priority == "high"
+        assert tasker.tag_task(task.id, ["infra", "ops", "infra"]).tags == ["infra", "ops"]
+        assert tasker.untag_task(task.id, ["infra"]).tags == ["ops"]
+        with pytest.raises(ValueError):
+            tasker.edit_task_priority(task.id, "urgent")
+        with pytest.raises(ValueError):
+            tasker.tag_task(task.id, ["two words"])
+
+    def test_old_records_load_with_defaults(self, test_file):
+        """Test loading records written before priorities and tags existed."""
+        with open(test_file, "w") as f:
+            json.dump([{"id": 1, "description": "Old", "status": "todo",
+                        "createdAt": "2024-11-29T10:00:00", "updatedAt": None}], f, indent=4)
+        tasker = Tasker(str(test_file))
+        assert tasker.get_task(1) == Task(1, "Old", "todo", "2024-11-29T10:00:00")
+        tasks, _ = tasker.query_tasks("priority = medium")
+        assert [task.id for task in tasks] == [1]
+        assert check_database(test_file).ok
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("priority = high and tag = infra and not status = done", [1]),
+        ("tag in (docs, ops)", [1, 2]),
+        ("tag != infra and priority != low", [2]),
+        ("not (priority = high or tag = docs)", [4]),
+        ("tag = missing", []),
+    ])
+    def test_bitmap_queries(self, tagged_tasker, expression, expected):
+        """Test that indexed queries only examine matching rows."""
+        tasks, plan = tagged_tasker.query_tasks(expression)
+        assert [task.id for task in tasks] == expected
+        assert plan.residual is None
+        assert plan.examined == len(expected)
+
+    def test_mixed_plan(self, tagged_tasker):
+        """Test bitmap lookups combined with id ranges and a residual."""
+        tasks, plan = tagged_tasker.query_tasks("tag = infra and id > 1 and description ~ keys")
+        assert [task.id for task in tasks] == [3]
+        assert [str(clause) for clause in plan.indexed] == ["tag = 'infra'"]
+        assert plan.examined == 1
+        assert "bitmap index" in plan.explain()
+
+    def test_huge_id_bounds_with_bitmap(self, tagged_tasker):
+        """Test that id bounds far beyond the data do not size the range mask."""
+        tasks, plan = tagged_tasker.query_tasks("tag = infra and id <= 20000000000")
+        assert [task.id for task in tasks] == [1, 3]
+        assert plan.bitmap is not None
+        tasks, _ = tagged_tasker.query_tasks("tag = infra and id >= 20000000000")
+        assert tasks == []
+        assert id_range_mask(20000000000, None, 8) & 0xff == 0
+        assert id_range_mask(None, 20000000000, 8).bit_length() == 9
+
+    def test_records_out_of_id_order(self, tagged_tasker):
+        """Test that a file edited out of id order falls back to a full scan."""
+        tasks = tagged_tasker._load_tasks()
+        tagged_tasker._save_tasks([tasks[2], tasks[0], tasks[1], tasks[3]])
+        tasks, plan = tagged_tasker.query_tasks("id >= 2")
+        assert [task.id for task in tasks] == [3, 2, 4]
+        assert "Access:\t\tfull scan" in plan.explain()
+        tasks, _ = tagged_tasker.query_tasks("tag = infra and id <= 3")
+        assert [task.id for task in tasks] == [3, 1]
+
+    def test_index_is_persisted(self, tagged_tasker):
+        """Test that the index file is created by a query and kept up to date."""
+        assert not tagged_tasker.index_file.exists()
+        tagged_tasker.query_tasks("tag = infra")
+        assert tagged_tasker.index_file.exists()
+        tagged_tasker.edit_task_status(1, "done")
+        index = TaskIndex.load(tagged_tasker.index_file)
+        assert list(iter_ids(index.lookup("tags", "infra"))) == [1, 3]
+        assert list(iter_ids(index.lookup("status", "done"))) == [1, 3]
+        assert index.signature == list(tagged_tasker._stat_signature())
+
+    def test_index_rebuilt_after_external_change(self, tagged_tasker):
+        """Test that an index older than the tasks file is rebuilt."""
+        records = json.loads(tagged_tasker.db_file.read_text())
+        records[1]["tags"] = ["infra"]
+        records[1].pop("checksum")
+        tagged_tasker.db_file.write_text(json.dumps(records, indent=4))
+        tasks, _ = tagged_tasker.query_tasks("tag = infra")
+        assert [task.id for task in tasks] == [1, 2, 3]
+
+    def test_parse_arguments_priority_and_tags(self, tasker):
+        """Test parsing priority and tag commands."""
+        tasker.add_task("Test task")
+        parse_arguments(["set-priority", "1", "low"], tasker)
+        parse_arguments(["tag", "1", "infra", "ops"], tasker)
+        tasks = parse_arguments(["untag", "1", "ops"], tasker)
+        assert (tasks[0].priority, tasks[0].tags) == ("low", ["infra"])
+# endregion
+
+# region Due Date Tests
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+@pytest.fixture
+def scheduled_tasker(tasker):
+    """Create a Tasker instance with one-off and recurring due dates."""
+    for description in ["Pay rent", "Standup", "Report", "Undated", "Shipped"]:
+        tasker.add_task(description)
+    tasker.edit_task_due(1, "2026-10-01", "monthly")
+    tasker.edit_task_due(2, "2026-10-20T09:00", "daily")
+    tasker.edit_task_due(3, "2026-10-15")
+    tasker.edit_task_due(5, "2026-10-10")
+    tasker.edit_task_status(5, "done")
+    return tasker
+
+
+class TestDueDates:
+    """Test due dates, recurrence and the due scheduler."""
+
+    def test_shift_keeps_day_of_month(self):
+        """Test that monthly occurrences clamp without drifting."""
+        anchor = datetime(2026, 1, 31)
+        assert [shift(anchor, "monthly", count).day for count in range(4)] == [31, 28, 31, 30]
+        assert shift(datetime(2024, 2, 29), "yearly", 1) == datetime(2025, 2, 28)
+
+    def test_next_due(self, scheduled_tasker):
+        """Test merging stored due dates with lazy recurring occurrences."""
+        tasks = scheduled_tasker.due_tasks(6, now=NOW)
+        assert [(task.id, task.due) for task in tasks] == [
+            (1, "2026-10-01T00:00:00"),
+            (3, "2026-10-15T00:00:00"),
+            (2, "2026-10-20T09:00:00"),
+            (2, "2026-10-21T09:00:00"),
+            (2, "2026-10-22T09:00:00"),
+            (2, "2026-10-23T09:00:00"),
+        ]
+
+    def test_recurring_occurrences_start_after_now(self, scheduled_tasker):
+        """Test that an overdue recurring task is not expanded into the past."""
+        tasks = scheduled_tasker.due_tasks(20, now=NOW)
+        rent = [task.due for task in tasks if task.id == 1]
+        assert rent == ["2026-10-01T00:00:00", "2026-11-01T00:00:00"]
+        assert len(tasks) == 20
+
+    def test_overdue(self, scheduled_tasker):
+        """Test listing overdue tasks, excluding done tasks."""
+        tasks = scheduled_tasker.due_tasks(None, overdue_only=True, now=NOW)
+        assert [task.id for task in tasks] == [1, 3]
+        assert scheduled_tasker.due_tasks(1, overdue_only=True, now=NOW)[0].id == 1
+
+    def test_due_index_follows_mutations(self, scheduled_tasker):
+        """Test that the due index is updated by status and due changes."""
+        scheduled_tasker.due_tasks(now=NOW)
+        scheduled_tasker.edit_task_status(3, "done")
+        scheduled_tasker.edit_task_due(1, None)
+        scheduled_tasker.edit_task_due(4, "2026-10-18")
+        tasks = scheduled_tasker.due_tasks(None, overdue_only=True, now=NOW)
+        assert [task.id for task in tasks] == [4]
+
+    def test_done_advances_recurring_task(self, scheduled_tasker):
+        """Test that completing a recurring task moves it to its next occurrence."""
+        task = scheduled_tasker.edit_task_status(2, "done", now=NOW)
+        assert (task.status, task.due) == ("todo", "2026-10-21T09:00:00")
+        task = scheduled_tasker.edit_task_status(1, "done", now=NOW)
+        assert (task.status, task.due) == ("todo", "2026-11-01T00:00:00")
+
+        tasks = scheduled_tasker.due_tasks(3, now=NOW)
+        assert [(task.id, task.due) for task in tasks] == [
+            (3, "2026-10-15T00:00:00"),
+            (2, "2026-10-21T09:00:00"),
+            (2, "2026-10-22T09:00:00"),
+        ]
+        assert scheduled_tasker.edit_task_status(3, "done", now=NOW).status == "done"
+
+    def test_due_with_ids_out_of_order(self, scheduled_tasker):
+        """Test that due tasks are found in a file edited out of id order."""
+        tasks = scheduled_tasker._load_tasks()
+        scheduled_tasker._save_tasks(tasks[2:] + tasks[:2])
+        tasks = scheduled_tasker.due_tasks(3, now=NOW)
+        assert [(task.id, task.description) for task in tasks] == [
+            (1, "Pay rent"), (3, "Report"), (2, "Standup")
+        ]
+
+    def test_invalid_due(self, tasker):
+        """Test rejecting invalid due dates and recurrence rules."""
+        task = tasker.add_task("Test task")
+        with pytest.raises(ValueError):
+            tasker.edit_task_due(task.id, "tomorrow")
+        with pytest.raises(ValueError):
+            tasker.edit_task_due(task.id, "2026-10-20", "hourly")
+        with pytest.raises(ValueError):
+            tasker.edit_task_due(task.id, None, "daily")
+
+    def test_where_due(self, scheduled_tasker):
+        """Test filtering by due date in expressions."""
+        tasks, _ = scheduled_tasker.query_tasks("due < 2026-10-16 and status != done")
+        assert [task.id for task in tasks] == [1, 3]
+
+    def test_fsck_checks_recurrence(self, scheduled_tasker):
+        """Test that fsck validates due dates and recurrence rules."""
+        text = scheduled_tasker.db_file.read_text().replace('"daily"', '"hourly"')
+        scheduled_tasker.db_file.write_text(text)
+        messages = [issue.message for issue in check_database(scheduled_tasker.db_file).errors]
+        assert "invalid recurrence 'hourly'" in messages
+
+    def test_parse_arguments_due(self, tasker):
+        """Test parsing due date commands."""
+        tasker.add_task("Test task")
+        tasks = parse_arguments(["set-due", "1", "2000-01-01", "weekly"], tasker)
+        assert (tasks[0].due, tasks[0].recurrence) == ("2000-01-01T00:00:00", "weekly")
+        assert len(parse_arguments(["due", "--next", "3"], tasker)) == 3
+        assert len(parse_arguments(["due", "--overdue"], tasker)) == 1
+        tasks = parse_arguments(["clear-due", "1"], tasker)
+        assert tasks[0].due is None and tasks[0].recurrence is None
+# endregion
+
+# region Integrity Tests
+class TestIntegrity:
+    """Test the integrity check and repair tools."""
+
+    def test_saved_records_have_checksums(self, populated_tasker):
+        """Test that saved records carry checksums hidden from Task."""
+        with open(populated_tasker.db_file) as f:
+            stored = json.load(f)
+        assert all("checksum" in record for record in stored)
+        assert populated_tasker.get_task(1) == Task(**{
+            key: value for key, value in stored[0].items() if key != "checksum"
+        })
+
+    def test_clean_database(self, populated_tasker):
+        """Test that a database written by Tasker passes the check."""
+        report = check_database(populated_tasker.db_file)
+        assert report.ok
+        assert report.records == 3
+        assert not report.warnings
+
+    def test_detects_corruption(self, populated_tasker):
+        """Test detection of checksum, schema and duplicate id problems."""
+        text = populated_tasker.db_file.read_text()
+        text = text.replace('"Test2"', '"Test9"').replace('"in-progress"', '"started"')
+        text = text.replace('"id": 3', '"id": 1')
+        populated_tasker.db_file.write_text(text)
+
+        messages = [issue.message for issue in check_database(populated_tasker.db_file).errors]
+        assert "checksum mismatch" in messages
+        assert "invalid status 'started'" in messages
+        assert "duplicate id" not in messages
+        assert len(messages) == 3
+
+    def test_detects_duplicate_id(self, tasker):
+        """Test detection of duplicate task ids."""
+        tasker.add_task("First")
+        tasks = tasker._load_tasks()
+        tasker._save_tasks(tasks + tasks)
+        report = check_database(tasker.db_file)
+        assert [issue.message for issue in report.errors] == ["duplicate id"]
+
+    def test_detects_truncated_file(self, populated_tasker):
+        """Test detection of a file cut off in the middle of a record."""
+        text = populated_tasker.db_file.read_text()
+        populated_tasker.db_file.write_text(text[:-20])
+        messages = [issue.message for issue in check_database(populated_tasker.db_file).errors]
+        assert messages[0] == "missing end of task array"
+        assert messages[1].startswith("unreadable record")
+
+    def test_old_files_only_warn(self, test_file):
+        """Test that records without checksums are reported as warnings."""
+        with open(test_file, "w") as f:
+            json.dump([{"id": 1, "description": "Old", "status": "todo",
+                        "createdAt": "2024-11-29T10:00:00", "updatedAt": None}], f, indent=4)
+        report = check_database(test_file)
+        assert report.ok
+        assert [issue.message for issue in report.warnings] == ["missing checksum"]
+
+    def test_incremental_skips_unchanged_records(self, populated_tasker):
+        """Test that an incremental check only revalidates changed records."""
+        check_database(populated_tasker.db_file)
+        populated_tasker.edit_task_description(2, "Changed")
+        report = check_database(populated_tasker.db_file, incremental=True)
+        assert report.ok
+        assert report.skipped == 2
+
+    def test_repair_salvages_readable_records(self, populated_tasker):
+        """Test that repair keeps every readable record."""
+        text = populated_tasker.db_file.read_text()
+        populated_tasker.db_file.write_text(text.replace('"Test2",', '"Test2\x00', 1))
+        assert not check_database(populated_tasker.db_file).ok
+
+        assert repair_database(populated_tasker.db_file) == (2, 1)
+        assert [task.id for task in populated_tasker.list_tasks()] == [1, 3]
+        assert check_database(populated_tasker.db_file).ok
+
+    def test_repair_drops_records_failing_validation(self, populated_tasker):
+        """Test that repair does not re-seal records with a checksum mismatch or schema errors."""
+        text = populated_tasker.db_file.read_text()
+        text = text.replace('"Test2"', '"Test9"').replace('"todo"', '"tXdo"')
+        populated_tasker.db_file.write_text(text)
+
+        assert repair_database(populated_tasker.db_file) == (1, 2)
+        assert [task.description for task in populated_tasker.list_tasks()] == ["Test3"]
+        assert "Test9" not in populated_tasker.db_file.read_text()
+        assert "Test9" in populated_tasker.db_file.with_name("test_tasks.json.corrupt").read_text()
+        assert check_database(populated_tasker.db_file).ok
+
+    def test_repeated_repair_keeps_earlier_copies(self, populated_tasker):
+        """Test that a second repair does not overwrite the first damaged copy."""
+        text = populated_tasker.db_file.read_text()
+        populated_tasker.db_file.write_text(text.replace('"Test2"', '"Test9"'))
+        assert repair_database(populated_tasker.db_file) == (2, 1)
+        assert repair_database(populated_tasker.db_file) == (2, 0)
+
+        first = populated_tasker.db_file.with_name("test_tasks.json.corrupt")
+        second = populated_tasker.db_file.with_name("test_tasks.json.corrupt.1")
+        assert "Test9" in first.read_text()
+        assert "Test9" not in second.read_text()
+
+    def test_detects_ids_out_of_order(self, populated_tasker):
+        """Test that ids must be strictly increasing, and repair sorts them."""
+        tasks = populated_tasker._load_tasks()
+        populated_tasker._save_tasks([tasks[2], tasks[0], tasks[1]])
+        report = check_database(populated_tasker.db_file)
+        assert [(issue.task_id, issue.message) for issue in report.errors] == [
+            (1, "id not in ascending order"),
+            (2, "id not in ascending order"),
+        ]
+
+        assert repair_database(populated_tasker.db_file) == (3, 0)
+        assert [task.id for task in populated_tasker.list_tasks()] == [1, 2, 3]
+        assert check_database(populated_tasker.db_file).ok
+
+    def test_repair_seals_old_records(self, test_file):
+        """Test that valid records without checksums are kept and sealed."""
+        with open(test_file, "w") as f:
+            json.dump([{"id": 1, "description": "Old", "status": "todo",
+                        "createdAt": "2024-11-29T10:00:00", "updatedAt": None}], f, indent=4)
+        assert repair_database(test_file) == (1, 0)
+        report = check_database(test_file)
+        assert report.ok and not report.warnings
+
+    def test_parse_arguments_fsck(self, populated_tasker, capsys):
+        """Test parsing fsck command."""
+        assert parse_arguments(["fsck"], populated_tasker) == []
+        assert "3 records (0 unchanged): 0 errors" in capsys.readouterr().out
+# endregion
+
+# region Backup Tests
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """Group records into blocks of four task ids."""
+    monkeypatch.setattr(backup, "BLOCK_RECORDS", 4)
+
+
+class TestBackup:
+    """Test incremental backups and restore."""
+
+    def test_backup_stores_only_changed_blocks(self, tasker, small_blocks):
+        """Test that a second backup only stores the block of an edited task."""
+        for number in range(10):
+            tasker.add_task(f"Task {number}")
+        first, stored = backup_database(tasker.db_file)
+        assert (first.point, first.records, stored) == (1, 10, 3)
+
+        tasker.edit_task_description(6, "Changed")
+        second, stored = backup_database(tasker.db_file)
+        assert (second.point, stored) == (2, 1)
+        assert second.blocks[0] == first.blocks[0]
+        assert second.blocks[2] == first.blocks[2]
+
+    def test_unchanged_file_reuses_latest_point(self, populated_tasker):
+        """Test that backing up an unchanged file creates no new point."""
+        first, _ = backup_database(populated_tasker.db_file)
+        assert backup_database(populated_tasker.db_file) == (first, 0)
+        assert len(list_backups(populated_tasker.db_file)) == 1
+
+    def test_removal_keeps_later_blocks(self, tasker, small_blocks):
+        """Test that removing a task does not shift the blocks after it."""
+        for number in range(10):
+            tasker.add_task(f"Task {number}")
+        first, _ = backup_database(tasker.db_file)
+        tasker.remove_task(2)
+        second, stored = backup_database(tasker.db_file)
+        assert stored == 1
+        assert second.blocks[1:] == first.blocks[1:]
+
+    def test_restore_is_byte_identical(self, populated_tasker, small_blocks):
+        """Test that restoring a point reproduces the backed-up file."""
+        original = populated_tasker.db_file.read_bytes()
+        backup_database(populated_tasker.db_file)
+        populated_tasker.remove_task(2)
+        populated_tasker.add_task("Later")
+        assert populated_tasker.query_tasks("status = done")[0] == []
+
+        assert restore_database(populated_tasker.db_file, 1) == 3
+        assert populated_tasker.db_file.read_bytes() == original
+        assert [task.id for task in populated_tasker.query_tasks("status = done")[0]] == [2]
+
+    def test_restore_empty_file(self, tasker):
+        """Test backup and restore of a file without tasks."""
+        point, stored = backup_database(tasker.db_file)
+        assert (point.records, point.blocks, stored) == (0, [], 0)
+        tasker.add_task("Later")
+        assert restore_database(tasker.db_file, 1) == 0
+        assert tasker.list_tasks() == []
+
+    def test_restore_rejects_damaged_block(self, populated_tasker):
+        """Test that a damaged block aborts the restore without touching the file."""
+        point, _ = backup_database(populated_tasker.db_file)
+        block = populated_tasker.db_file.with_name("test_tasks.json.backups") / "blocks" / point.blocks[0]
+        block.write_bytes(b"garbage")
+        current = populated_tasker.db_file.read_bytes()
+
+        with pytest.raises(ValueError, match="unreadable"):
+            restore_database(populated_tasker.db_file, point.point)
+        with pytest.raises(ValueError, match="not found"):
+            restore_database(populated_tasker.db_file, 7)
+        assert populated_tasker.db_file.read_bytes() == current
+        assert not populated_tasker.db_file.with_name("test_tasks.json.restore").exists()
+
+    def test_retention_collects_unreferenced_blocks(self, tasker, small_blocks):
+        """Test that pruning old points deletes blocks only they referenced."""
+        for number in range(3):
+            tasker.add_task(f"Task {number}")
+            backup_database(tasker.db_file, keep=None)
+        assert [point.point for point in list_backups(tasker.db_file)] == [1, 2, 3]
+
+        assert prune_backups(tasker.db_file, 1) == (2, 2)
+        latest = list_backups(tasker.db_file)
+        assert [point.point for point in latest] == [3]
+        assert restore_database(tasker.db_file, 3) == 3
+
+        tasker.add_task("Task 3")
+        assert backup_database(tasker.db_file, keep=1)[0].point == 4
+        assert [point.point for point in list_backups(tasker.db_file)] == [4]
+
+    def test_parse_arguments_backup(self, populated_tasker, capsys):
+        """Test parsing backup, backups and restore commands."""
+        assert parse_arguments(["backup", "--keep", "2"], populated_tasker) == []
+        assert "Backup point 1: 3 records, 1 of 1 blocks stored" in capsys.readouterr().out
+        populated_tasker.remove_task(1)
+        assert parse_arguments(["backups"], populated_tasker) == []
+        assert "1 backup points" in capsys.readouterr().out
+        assert len(parse_arguments(["restore", "1"], populated_tasker)) == 3
+# endregion
+
+# region Watch Tests
+class TestWatch:
+    """Test change detection and the watch command."""
+
+    def test_first_poll_reports_all_tasks(self, populated_tasker):
+        """Test that the first poll reports every task as added."""
+        changes = populated_tasker.poll_changes()
+        assert [task.id for task in changes.added] == [1, 2, 3]
+        assert not changes.updated and not changes.removed
+
+    def test_idle_poll_is_empty(self, populated_tasker):
+        """Test that polling an unchanged file reports nothing."""
+        populated_tasker.poll_changes()
+        assert not populated_tasker.poll_changes()
+
+    def test_poll_reports_diff(self, populated_tasker):
+        """Test that only changed tasks are reported."""
+        populated_tasker.poll_changes()
+        populated_tasker.edit_task_description(1, "Changed description")
+        populated_tasker.remove_task(2)
+        populated_tasker.add_task("Test4")
+
+        changes = populated_tasker.poll_changes()
+        assert [task.id for task in changes.added] == [4]
+        assert [task.description for task in changes.updated] == ["Changed description"]
+        assert changes.removed == [2]
+
+    def test_poll_skips_partially_written_file(self, populated_tasker):
+        """Test that a truncated file is retried on the next poll."""
+        populated_tasker.poll_changes()
+        text = populated_tasker.db_file.read_text()
+        populated_tasker.db_file.write_text(text[:len(text) // 2])
+        assert not populated_tasker.poll_changes()
+
+        populated_tasker.db_file.write_text(text.replace('"Test1"', '"Changed"'))
+        changes = populated_tasker.poll_changes()
+        assert [task.description for task in changes.updated] == ["Changed"]
+
+    def test_save_replaces_file(self, populated_tasker):
+        """Test that saving leaves no temporary file behind."""
+        populated_tasker.add_task("Test4")
+        assert not populated_tasker.db_file.with_name("test_tasks.json.partial").exists()
+
+    def test_subscribers_are_notified(self, populated_tasker):
+        """Test that subscribers receive changes until unsubscribed."""
+        received = []
+        populated_tasker.subscribe(received.append)
+        populated_tasker.poll_changes()
+        populated_tasker.edit_task_status(1, "done")
+        populated_tasker.poll_changes()
+        populated_tasker.unsubscribe(received.append)
+        populated_tasker.edit_task_status(1, "todo")
+        populated_tasker.poll_changes()
+
+        assert len(received) == 2
+        assert [task.status for task in received[1].updated] == ["done"]
+
+    def test_watch_prints_filtered_view(self, populated_tasker, capsys):
+        """Test that watch renders only tasks matching the status."""
+        watch_tasks(populated_tasker, "in-progress", interval=0, iterations=1)
+        output = capsys.readouterr().out
+        assert "Test3" in output
+        assert "Test1" not in output
+
+    def test_watch_reports_tasks_leaving_view(self, populated_tasker, capsys, monkeypatch):
+        """Test that a status change out of the view is rendered as a notice."""
+        monkeypatch.setattr(
+                "task_cli.task_cli.time.sleep",
+                lambda _: populated_tasker.edit_task_status(3, "done"),
+        )
+        watch_tasks(populated_tasker, "in-progress", interval=0, iterations=2)
+        output = capsys.readouterr().out
+        assert output.count("Test3") == 1
+        assert "#Task 3:\tleft `in-progress`" in output
+# endregion
+
 # region Task Model Tests
 def test_task_creation():
     """Test Task dataclass creation and defaults."""